@@ -3,13 +3,15 @@ from __future__ import annotations
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
-from django.db import models
+from django.core.paginator import Paginator
+from django.db import connection, models
 from django.db.models import Count, QuerySet
-from django.db.models.functions import Cast
 from django.http import HttpRequest
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 
+from beers.api.utils import invalidate_beer_representations
 from beers.models import (
     Badge,
     Beer,
@@ -33,6 +35,31 @@ from beers.models import (
 )
 
 
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self) -> int:
+        query = getattr(self.object_list, "query", None)
+        if query is None or query.where:
+            return super().count
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [self.object_list.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < ESTIMATED_COUNT_THRESHOLD:
+            return super().count
+        return int(row[0])
+
+
+class FastAdmin(admin.ModelAdmin):
+    show_full_result_count = False
+    list_per_page = 25
+
+
 def _thumb(url: str | None) -> str:
     if not url:
         return "\u2014"
@@ -72,6 +99,9 @@ class TastedInline(admin.TabularInline):
     readonly_fields = ("beer",)
     raw_id_fields = ("beer",)
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Tasted]:
+        return super().get_queryset(request).select_related("beer")
+
 
 class BeerBreweryInline(admin.TabularInline):
     model = Beer
@@ -93,7 +123,7 @@ class BeerBreweryInline(admin.TabularInline):
 
 
 @admin.register(Beer)
-class BeerAdmin(admin.ModelAdmin):
+class BeerAdmin(FastAdmin):
     list_display = (
         "vmp_name",
         "main_category",
@@ -111,6 +141,7 @@ class BeerAdmin(admin.ModelAdmin):
     )
     list_editable = ("match_manually", "active")
     ordering = ("-created_at",)
+    paginator = EstimatedCountPaginator
     readonly_fields = ("label_preview",)
     search_fields = (
         "vmp_name",
@@ -125,6 +156,10 @@ class BeerAdmin(admin.ModelAdmin):
     def label_preview(self, obj: Beer) -> str:
         return _thumb(obj.label_hd_url)
 
+    def save_model(self, request: HttpRequest, obj: Beer, form, change: bool) -> None:
+        super().save_model(request, obj, form, change)
+        invalidate_beer_representations()
+
 
 @admin.register(MatchManually)
 class MatchManuallyAdmin(BeerAdmin):
@@ -143,7 +178,7 @@ class MatchManuallyAdmin(BeerAdmin):
 
 
 @admin.register(Brewery)
-class BreweryAdmin(admin.ModelAdmin):
+class BreweryAdmin(FastAdmin):
     list_display = ("name", "untpd_url", "logo_preview", "untpd_updated")
     search_fields = ("name", "untpd_url")
     ordering = ("name",)
@@ -182,23 +217,26 @@ class StockInline(admin.TabularInline):
 
 
 @admin.register(Store)
-class StoreAdmin(admin.ModelAdmin):
+class StoreAdmin(FastAdmin):
     list_display = ("name", "store_id", "address", "store_updated")
     search_fields = ("name", "store_id")
     inlines = (StockInline,)
 
 
 @admin.register(VmpCrawlState)
-class VmpCrawlStateAdmin(admin.ModelAdmin):
+class VmpCrawlStateAdmin(FastAdmin):
     list_display = ("scope", "category", "page", "started")
 
 
 @admin.register(Stock)
-class StockAdmin(admin.ModelAdmin):
+class StockAdmin(FastAdmin):
     list_display = ("store", "beer", "quantity", "stock_updated")
     search_fields = ("store__name", "beer__vmp_name")
     autocomplete_fields = ("store", "beer")
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Stock]:
+        return super().get_queryset(request).select_related("store", "beer")
+
 
 class ReleaseBeerInline(admin.TabularInline):
     model = Release.beer.through
@@ -233,7 +271,7 @@ class ReleaseBeerInline(admin.TabularInline):
 
 
 @admin.register(Release)
-class ReleaseAdmin(admin.ModelAdmin):
+class ReleaseAdmin(FastAdmin):
     list_display = ("name", "active", "release_date", "beer_count")
     ordering = ("-release_date",)
     exclude = ("beer",)
@@ -248,7 +286,7 @@ class ReleaseAdmin(admin.ModelAdmin):
 
 
 @admin.register(Country)
-class CountryAdmin(admin.ModelAdmin):
+class CountryAdmin(FastAdmin):
     list_display = ("name", "iso_code")
     search_fields = ("name", "iso_code")
 
@@ -262,7 +300,7 @@ class CustomUserAdmin(UserAdmin):
 
 
 @admin.register(UserWithTasted)
-class UserWithTastedAdmin(admin.ModelAdmin):
+class UserWithTastedAdmin(FastAdmin):
     list_display = ("username", "email", "tasted_count")
     search_fields = ("username", "email")
     fields = ("username", "email")
@@ -296,19 +334,23 @@ class UserListItemInline(admin.TabularInline):
     readonly_fields = ("beer_name", "created_at")
     ordering = ("sort_order",)
 
-    def get_queryset(self, request: HttpRequest) -> QuerySet:
-        qs = super().get_queryset(request)
-        return qs.annotate(
-            _beer_name=models.Subquery(
-                Beer.objects.filter(
-                    vmp_id=Cast(models.OuterRef("product_id"), models.BigIntegerField())
-                ).values("vmp_name")[:1]
-            )
+    def get_formset(self, request: HttpRequest, obj: UserList | None = None, **kwargs):
+        product_ids = (
+            obj.items.values_list("product_id", flat=True) if obj is not None else []
         )
+        vmp_ids = [int(pid) for pid in product_ids if pid.isdigit()]
+        self._beer_names = {
+            str(vmp_id): name
+            for vmp_id, name in Beer.objects.filter(vmp_id__in=vmp_ids).values_list(
+                "vmp_id", "vmp_name"
+            )
+        }
+        return super().get_formset(request, obj, **kwargs)
 
     @admin.display(description="Beer")
-    def beer_name(self, obj):
-        return getattr(obj, "_beer_name", None) or f"Unknown ({obj.product_id})"
+    def beer_name(self, obj: UserListItem) -> str:
+        beer_names = getattr(self, "_beer_names", {})
+        return beer_names.get(obj.product_id) or f"Unknown ({obj.product_id})"
 
 
 class UserListInline(admin.TabularInline):
@@ -318,12 +360,15 @@ class UserListInline(admin.TabularInline):
     readonly_fields = ("share_token", "item_count")
     show_change_link = True
 
-    @admin.display(description="Items")
-    def item_count(self, obj):
-        return obj.items.count()
+    def get_queryset(self, request: HttpRequest) -> QuerySet[UserList]:
+        return super().get_queryset(request).annotate(_item_count=Count("items"))
 
+    @admin.display(description="Items", ordering="_item_count")
+    def item_count(self, obj: UserList) -> int:
+        return obj._item_count
 
-class UserListAdmin(admin.ModelAdmin):
+
+class UserListAdmin(FastAdmin):
     list_display = (
         "name",
         "user",
@@ -364,16 +409,24 @@ class UserListAdmin(admin.ModelAdmin):
     readonly_fields = ("user", "share_token", "created_at", "updated_at")
     inlines = [UserListItemInline]
 
-    @admin.display(description="Items")
-    def item_count(self, obj):
-        return obj.items.count()
+    def get_queryset(self, request: HttpRequest) -> QuerySet[UserList]:
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("user")
+            .annotate(_item_count=Count("items"))
+        )
+
+    @admin.display(description="Items", ordering="_item_count")
+    def item_count(self, obj: UserList) -> int:
+        return obj._item_count
 
 
 admin.site.register(UserList, UserListAdmin)
 
 
 @admin.register(UserWithLists)
-class UserWithListsAdmin(admin.ModelAdmin):
+class UserWithListsAdmin(FastAdmin):
     list_display = ("username", "email", "list_count")
     search_fields = ("username", "email")
     fields = ("username", "email")
@@ -421,7 +474,7 @@ class UntappdCheckinInline(admin.TabularInline):
 
 
 @admin.register(UserWithCheckins)
-class UserWithCheckinsAdmin(admin.ModelAdmin):
+class UserWithCheckinsAdmin(FastAdmin):
     list_display = ("username", "email", "checkin_count", "unsynced_count")
     search_fields = ("username", "email")
     fields = ("username", "email")
@@ -458,24 +511,26 @@ class UserWithCheckinsAdmin(admin.ModelAdmin):
 
 
 @admin.register(UntappdRssFeed)
-class UntappdRssFeedAdmin(admin.ModelAdmin):
+class UntappdRssFeedAdmin(FastAdmin):
     list_display = ("user", "feed_url", "last_synced", "active")
     list_filter = ("active",)
     search_fields = ("user__username", "user__email")
     readonly_fields = ("last_synced", "created_at")
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[UntappdRssFeed]:
+        return super().get_queryset(request).select_related("user")
+
 
 @admin.register(FollowedList)
-class FollowedListAdmin(admin.ModelAdmin):
+class FollowedListAdmin(FastAdmin):
     list_display = ("user", "share_token", "created_at")
     list_filter = ("created_at",)
     search_fields = ("user__username", "share_token")
     raw_id_fields = ("user",)
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[FollowedList]:
+        return super().get_queryset(request).select_related("user")
+
 
-admin.site.register(Badge)
-admin.site.register(ExternalAPI)
-admin.site.register(Option)
-admin.site.register(UntappdList)
-admin.site.register(VmpNotReleased)
-admin.site.register(WrongMatch)
+for model in (Badge, ExternalAPI, Option, UntappdList, VmpNotReleased, WrongMatch):
+    admin.site.register(model, FastAdmin)
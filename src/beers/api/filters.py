@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from beers.models import Beer, Stock, Tasted
+from beers.models import Beer, Release, Stock, Tasted
 from django.db.models import Exists, F, OuterRef, Q, QuerySet
+from django.db.models.functions import Lower
 from django_filters import rest_framework as flt
 from rest_framework import filters
 from rest_framework.request import Request
@@ -71,53 +72,72 @@ class BeerFilter(flt.FilterSet):
                 query |= Q(**{field_lookup: value})
         return query
 
+    def _build_in_values(self, values: str) -> list[str]:
+        return [v.strip().lower() for v in values.split(",") if v.strip()]
+
+    def _filter_lower_in(self, queryset: QuerySet, values: str, field: str) -> QuerySet:
+        lowered = self._build_in_values(values)
+        if not lowered:
+            return queryset
+        return queryset.alias(**{f"{field}_lower": Lower(field)}).filter(
+            **{f"{field}_lower__in": lowered}
+        )
+
     def custom_style_filter(
         self, queryset: QuerySet[Beer], name: str, value: str
     ) -> QuerySet[Beer]:
         query = self._build_multi_value_query(value, "style__icontains")
-        return queryset.filter(query).distinct()
+        return queryset.filter(query)
 
     def custom_product_selection_filter(
         self, queryset: QuerySet[Beer], name: str, value: str
     ) -> QuerySet[Beer]:
-        query = self._build_multi_value_query(value, "product_selection__iexact")
-        return queryset.filter(query).distinct()
+        return self._filter_lower_in(queryset, value, "product_selection")
 
     def custom_store_filter(
         self, queryset: QuerySet[Beer], name: str, value: str
     ) -> QuerySet[Beer]:
-        query = Q()
-        for store_id in value.split(","):
-            store_id = store_id.strip()
-            if store_id.isdigit():
-                query |= Q(stock_set__store__exact=int(store_id)) & ~Q(
-                    stock_set__quantity=0
-                )
-        return queryset.filter(query).distinct()
+        store_ids = [
+            int(store_id)
+            for store_id in map(str.strip, value.split(","))
+            if store_id.isdigit()
+        ]
+        if not store_ids:
+            return queryset
+        in_stock = Stock.objects.filter(
+            beer=OuterRef("pk"), store_id__in=store_ids
+        ).exclude(quantity=0)
+        return queryset.filter(Exists(in_stock))
 
     def custom_country_filter(
         self, queryset: QuerySet[Beer], name: str, value: str
     ) -> QuerySet[Beer]:
-        query = self._build_multi_value_query(value, "country__name__iexact")
-        return queryset.filter(query).distinct()
+        return self._filter_lower_in(queryset, value, "country")
 
     def custom_release_filter(
         self, queryset: QuerySet[Beer], name: str, value: str
     ) -> QuerySet[Beer]:
-        query = self._build_multi_value_query(value, "release__name__iexact")
-        return queryset.filter(query).distinct()
+        names = self._build_in_values(value)
+        if not names:
+            return queryset
+        releases = Release.objects.alias(name_lower=Lower("name")).filter(
+            name_lower__in=names
+        )
+        in_release = Release.beer.through.objects.filter(
+            beer=OuterRef("pk"), release__in=releases
+        )
+        return queryset.filter(Exists(in_release))
 
     def custom_allergen_filter(
         self, queryset: QuerySet[Beer], name: str, value: str
     ) -> QuerySet[Beer]:
         query = self._build_multi_value_query(value, "allergens__icontains")
-        return queryset.exclude(query).distinct()
+        return queryset.exclude(query)
 
     def custom_main_category_filter(
         self, queryset: QuerySet[Beer], name: str, value: str
     ) -> QuerySet[Beer]:
-        query = self._build_multi_value_query(value, "main_category__iexact")
-        return queryset.filter(query).distinct()
+        return self._filter_lower_in(queryset, value, "main_category")
 
     def custom_user_tasted_filter(
         self, queryset: QuerySet[Beer], name: str, value: bool
@@ -168,7 +188,7 @@ class StockChangeFilter(flt.FilterSet):
         self, queryset: QuerySet[Stock], name: str, value: str
     ) -> QuerySet[Stock]:
         if value.isdigit():
-            return queryset.filter(store__exact=int(value)).distinct()
+            return queryset.filter(store__exact=int(value))
         return queryset.none()
 
     class Meta:
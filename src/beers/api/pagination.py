@@ -1,5 +1,15 @@
+from __future__ import annotations
+
+import hashlib
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 
+COUNT_CACHE_SECONDS = 30
+
 
 class Pagination(PageNumberPagination):
     page_size = 25
@@ -11,3 +21,25 @@ class LargeResultPagination(PageNumberPagination):
     page_size = 25
     max_page_size = 1000
     page_size_query_param = "page_size"
+
+
+class CachedCountPaginator(Paginator):
+    @cached_property
+    def count(self) -> int:
+        try:
+            sql = str(self.object_list.query)
+        except (AttributeError, EmptyResultSet):
+            return super().count
+        key = f"page_count:{hashlib.md5(sql.encode()).hexdigest()}"
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, COUNT_CACHE_SECONDS)
+        return count
+
+
+class CachedCountPagination(LargeResultPagination):
+    def paginate_queryset(self, queryset, request, view=None):
+        if not request.user.is_authenticated:
+            self.django_paginator_class = CachedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import re
 from datetime import date
 
 import feedparser
 import requests as http_requests
 from beers.models import (
-    Badge,
     Beer,
     Brewery,
     Country,
@@ -18,13 +18,18 @@ from beers.models import (
     UserListItem,
     WrongMatch,
 )
-from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
 from django_q.models import OrmQ, Task
 from drf_dynamic_fields import DynamicFieldsMixin
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
 
-from .utils import parse_bool
+from .utils import beer_representation_version, parse_bool, parse_store_id
+
+BEER_REPRESENTATION_TTL = 60 * 5
+_URL_LOOKUP_PLACEHOLDER = "__lookup__"
 
 
 class BrewerySerializer(serializers.ModelSerializer):
@@ -33,8 +38,64 @@ class BrewerySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "untpd_url", "label_url", "description"]
 
 
+class TemplatedIdentityField(serializers.HyperlinkedIdentityField):
+    def get_url(self, obj, view_name, request, format):
+        lookup_value = getattr(obj, self.lookup_field, None)
+        if lookup_value in (None, ""):
+            return None
+        templates = self.__dict__.setdefault("_url_templates", {})
+        template = templates.get(format)
+        if template is None:
+            template = self.reverse(
+                view_name,
+                kwargs={self.lookup_url_kwarg: _URL_LOOKUP_PLACEHOLDER},
+                request=request,
+                format=format,
+            )
+            templates[format] = template
+        return template.replace(_URL_LOOKUP_PLACEHOLDER, str(lookup_value), 1)
+
+
+class BeerListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        beers = list(iterable)
+        child = self.child
+        readable = list(child._readable_fields)
+        cached_fields = [
+            f for f in readable if f.field_name not in child.uncached_fields
+        ]
+        dynamic_fields = [f for f in readable if f.field_name in child.uncached_fields]
+
+        version = beer_representation_version()
+        keys = {
+            beer.pk: child.representation_key(beer, cached_fields, version)
+            for beer in beers
+        }
+        cached = cache.get_many(list(keys.values()))
+        missing = {}
+        results = []
+        for beer in beers:
+            key = keys[beer.pk]
+            static = cached.get(key)
+            if static is None:
+                static = child.represent(beer, cached_fields)
+                missing[key] = static
+            merged = {**static, **child.represent(beer, dynamic_fields)}
+            results.append(
+                {
+                    f.field_name: merged[f.field_name]
+                    for f in readable
+                    if f.field_name in merged
+                }
+            )
+        if missing:
+            cache.set_many(missing, BEER_REPRESENTATION_TTL)
+        return results
+
+
 class BeerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name="beer-detail")
+    url = TemplatedIdentityField(view_name="beer-detail")
     badges = serializers.SerializerMethodField("get_badges")
     stock = serializers.SerializerMethodField("get_stock")
     all_stock = serializers.SerializerMethodField("get_all_stock")
@@ -49,27 +110,73 @@ class BeerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
         source="country.iso_code", read_only=True, allow_null=True
     )
     value_score = serializers.FloatField(read_only=True)
-    user_tasted = serializers.BooleanField(read_only=True)
+    user_tasted = serializers.SerializerMethodField("get_user_tasted")
+
+    uncached_fields = frozenset({"url", "badges", "stock", "all_stock", "user_tasted"})
+
+    def represent(self, beer: Beer, fields: list) -> dict:
+        ret = {}
+        for field in fields:
+            try:
+                attribute = field.get_attribute(beer)
+            except SkipField:
+                continue
+            if isinstance(attribute, PKOnlyObject):
+                check_for_none = attribute.pk
+            else:
+                check_for_none = attribute
+            if check_for_none is None:
+                ret[field.field_name] = None
+            else:
+                ret[field.field_name] = field.to_representation(attribute)
+        return ret
+
+    def representation_key(self, beer: Beer, fields: list, version: int) -> str:
+        stamps = ":".join(
+            str(stamp.timestamp()) if stamp else "-"
+            for stamp in (
+                beer.vmp_updated,
+                beer.untpd_updated,
+                beer.vmp_details_fetched,
+            )
+        )
+        names = ",".join(field.field_name for field in fields)
+        signature = hashlib.md5(names.encode()).hexdigest()
+        return f"beer_repr:v{version}:{beer.pk}:{stamps}:{signature}"
+
+    def get_user_tasted(self, beer: Beer) -> bool:
+        rows = getattr(beer, "_user_tasted", None)
+        if rows is not None:
+            return bool(rows)
+        return bool(getattr(beer, "user_tasted", False))
 
     def get_badges(self, beer: Beer):
-        return BadgeSerializer(instance=beer.badge_set.all(), many=True).data
+        return [{"text": badge.text} for badge in beer.badge_set.all()]
 
     def get_stock(self, beer: Beer) -> int | None:
-        store = self.context["request"].query_params.get("store") or self.context[
-            "request"
-        ].query_params.get("check_store")
-        if store is not None and "," not in store:
-            for s in beer.stock_set.all():
-                if str(s.store_id) == store:
-                    return s.quantity
+        if hasattr(beer, "store_quantity"):
+            return beer.store_quantity
+        store_id = parse_store_id(self.context["request"].query_params)
+        if store_id is None:
             return None
-        return None
+        store_stock = [s for s in beer.stock_set.all() if s.store_id == store_id]
+        return store_stock[0].quantity if store_stock else None
 
     def get_all_stock(self, beer: Beer):
         all_stock = self.context["request"].query_params.get("all_stock")
         if all_stock and parse_bool(all_stock):
-            stocked = [s for s in beer.stock_set.all() if s.quantity != 0]
-            return AllStockSerializer(instance=stocked, many=True).data
+            active_stock = getattr(beer, "active_stock", None)
+            if active_stock is None:
+                active_stock = [s for s in beer.stock_set.all() if s.quantity != 0]
+            return [
+                {
+                    "store_name": s.store.name,
+                    "quantity": s.quantity,
+                    "gps_lat": s.store.gps_lat,
+                    "gps_long": s.store.gps_long,
+                }
+                for s in active_stock
+            ]
         return None
 
     class Meta:
@@ -132,16 +239,7 @@ class BeerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
             "value_score",
             "user_tasted",
         ]
-
-
-class AllStockSerializer(serializers.ModelSerializer):
-    store_name = serializers.CharField(read_only=True, source="store.name")
-    gps_lat = serializers.FloatField(read_only=True, source="store.gps_lat")
-    gps_long = serializers.FloatField(read_only=True, source="store.gps_long")
-
-    class Meta:
-        model = Stock
-        fields = ["store_name", "quantity", "gps_lat", "gps_long"]
+        list_serializer_class = BeerListSerializer
 
 
 class StockChangeBeerSerializer(BeerSerializer):
@@ -185,21 +283,6 @@ class StockChangeSerializer(serializers.ModelSerializer):
         ]
 
 
-class BadgeSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Badge
-        fields = ["text"]
-
-
-class AppRatingSerializer(serializers.ModelSerializer):
-    rating = serializers.FloatField()
-    count = serializers.IntegerField()
-
-    class Meta:
-        model = User
-        fields = ["rating", "count"]
-
-
 class StoreSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Store
@@ -223,7 +306,7 @@ class StockSerializer(serializers.ModelSerializer):
 
 
 class WrongMatchSerializer(serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name="wrongmatch-detail")
+    url = TemplatedIdentityField(view_name="wrongmatch-detail")
     beer_name = serializers.CharField(read_only=True, source="beer.vmp_name")
     current_untpd_url = serializers.CharField(read_only=True, source="beer.untpd_url")
     current_untpd_id = serializers.CharField(read_only=True, source="beer.untpd_id")
@@ -313,8 +396,84 @@ class UserListItemUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
+def preload_item_prices(user_lists: list[UserList]) -> None:
+    pending = [u for u in user_lists if getattr(u, "_item_prices", None) is None]
+    product_ids = {
+        item.product_id
+        for user_list in pending
+        for item in user_list.items.all()
+        if item.product_id.isdigit()
+    }
+    prices = (
+        {
+            str(vmp_id): price
+            for vmp_id, price in Beer.objects.filter(
+                vmp_id__in=product_ids, price__isnull=False
+            ).values_list("vmp_id", "price")
+        }
+        if product_ids
+        else {}
+    )
+    for user_list in pending:
+        user_list._item_prices = {
+            item.product_id: prices[item.product_id]
+            for item in user_list.items.all()
+            if item.product_id in prices
+        }
+
+
+def preload_sync_status(user_lists: list[UserList]) -> None:
+    task_ids = {
+        u.untappd_list.sync_task_id
+        for u in user_lists
+        if u.untappd_list and u.untappd_list.sync_task_id
+    }
+    finished = (
+        dict(Task.objects.filter(id__in=task_ids).values_list("id", "success"))
+        if task_ids
+        else {}
+    )
+    queued = (
+        set(
+            OrmQ.objects.filter(key__in=task_ids - finished.keys()).values_list(
+                "key", flat=True
+            )
+        )
+        if task_ids - finished.keys()
+        else set()
+    )
+    for user_list in user_lists:
+        task_id = (
+            user_list.untappd_list.sync_task_id if user_list.untappd_list else None
+        )
+        if not task_id:
+            user_list._sync_status = None
+        elif task_id in finished:
+            user_list._sync_status = "success" if finished[task_id] else "failed"
+        elif task_id in queued:
+            user_list._sync_status = "queued"
+        else:
+            user_list._sync_status = "running"
+
+
+class UserListListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        user_lists = list(iterable)
+        preload_item_prices(user_lists)
+        if "sync_status" in self.child.fields:
+            preload_sync_status(user_lists)
+        self.context.setdefault("today", date.today())
+        return super().to_representation(user_lists)
+
+
 class UserListMethodsMixin:
     def _untappd_product_ids(self, obj: UserList) -> list[str] | None:
+        if not hasattr(obj, "_untappd_ids"):
+            obj._untappd_ids = self._match_untappd_product_ids(obj)
+        return obj._untappd_ids
+
+    def _match_untappd_product_ids(self, obj: UserList) -> list[str] | None:
         if not obj.untappd_list:
             return None
         beer_ids = obj.untappd_list.untappd_beer_ids or []
@@ -336,53 +495,44 @@ class UserListMethodsMixin:
             result.append(pid)
         return result
 
+    def _item_prices(self, obj: UserList) -> dict[str, float]:
+        if getattr(obj, "_item_prices", None) is None:
+            preload_item_prices([obj])
+        return obj._item_prices
+
+    def _items_value(self, obj: UserList) -> float:
+        prices = self._item_prices(obj)
+        total = sum(
+            item.quantity * prices.get(item.product_id, 0) for item in obj.items.all()
+        )
+        return round(total, 2)
+
     def get_item_count(self, obj: UserList) -> int:
         untappd_ids = self._untappd_product_ids(obj)
         if untappd_ids is not None:
             return len(untappd_ids)
-        return obj.items.aggregate(total=models.Sum("quantity"))["total"] or 0
+        return sum(item.quantity for item in obj.items.all())
 
     def get_product_ids(self, obj: UserList) -> list[str]:
         untappd_ids = self._untappd_product_ids(obj)
         if untappd_ids is not None:
             return untappd_ids
-        return list(obj.items.values_list("product_id", flat=True))
+        return [item.product_id for item in obj.items.all()]
 
     def get_is_past(self, obj: UserList) -> bool | None:
         if not obj.event_date:
             return None
-        return obj.event_date < date.today()
+        return obj.event_date < (self.context.get("today") or date.today())
 
     def get_stats(self, obj: UserList) -> dict | None:
         if not obj.show_vintage:
             return None
 
         items = obj.items.all()
-        if not items.exists():
-            return {
-                "total_bottles": 0,
-                "total_value": 0,
-                "oldest_year": None,
-                "newest_year": None,
-            }
-
-        total_bottles = items.aggregate(total=models.Sum("quantity"))["total"] or 0
-        years = items.exclude(year__isnull=True).values_list("year", flat=True)
-
-        product_ids = [item.product_id for item in items]
-        prices = {
-            str(vmp_id): price
-            for vmp_id, price in Beer.objects.filter(
-                vmp_id__in=product_ids
-            ).values_list("vmp_id", "price")
-        }
-        total_value = sum(
-            item.quantity * (prices.get(item.product_id) or 0) for item in items
-        )
-
+        years = [item.year for item in items if item.year is not None]
         return {
-            "total_bottles": total_bottles,
-            "total_value": round(total_value, 2),
+            "total_bottles": sum(item.quantity for item in items),
+            "total_value": self._items_value(obj),
             "oldest_year": min(years) if years else None,
             "newest_year": max(years) if years else None,
         }
@@ -390,19 +540,7 @@ class UserListMethodsMixin:
     def get_total_price(self, obj: UserList) -> float | None:
         if not obj.show_store:
             return None
-
-        items = list(obj.items.all())
-        product_ids = [item.product_id for item in items]
-        prices = {
-            str(vmp_id): price
-            for vmp_id, price in Beer.objects.filter(
-                vmp_id__in=product_ids
-            ).values_list("vmp_id", "price")
-        }
-        total = sum(
-            item.quantity * (prices.get(item.product_id) or 0) for item in items
-        )
-        return round(total, 2)
+        return self._items_value(obj)
 
     def get_is_read_only(self, obj: UserList) -> bool:
         return obj.untappd_list_id is not None
@@ -474,19 +612,12 @@ class UserListSerializer(UserListMethodsMixin, serializers.ModelSerializer):
             "last_synced",
             "sync_status",
         ]
+        list_serializer_class = UserListListSerializer
 
     def get_sync_status(self, obj: UserList) -> str | None:
-        if not obj.untappd_list:
-            return None
-        task_id = obj.untappd_list.sync_task_id
-        if not task_id:
-            return None
-        task = Task.objects.filter(id=task_id).first()
-        if task:
-            return "failed" if not task.success else "success"
-        if OrmQ.objects.filter(key=task_id).exists():
-            return "queued"
-        return "running"
+        if not hasattr(obj, "_sync_status"):
+            preload_sync_status([obj])
+        return obj._sync_status
 
     def get_items(self, obj: UserList):
         if not self.context.get("include_items", False):
@@ -663,6 +794,7 @@ class SharedUserListSerializer(UserListMethodsMixin, serializers.ModelSerializer
             "is_read_only",
             "last_synced",
         ]
+        list_serializer_class = UserListListSerializer
 
     def get_items(self, obj: UserList):
         items = obj.items.all()
@@ -671,18 +803,24 @@ class SharedUserListSerializer(UserListMethodsMixin, serializers.ModelSerializer
         ).data
 
     def get_user_name(self, obj: UserList) -> str:
+        owner_name = getattr(obj, "owner_name", None)
+        if owner_name is not None:
+            return owner_name
         if obj.user.first_name or obj.user.last_name:
             return f"{obj.user.first_name} {obj.user.last_name}".strip()
         return obj.user.username
 
     def get_store_name(self, obj: UserList) -> str | None:
-        if obj.selected_store_id:
-            return getattr(obj, "_store_name", None) or (
-                Store.objects.filter(store_id=obj.selected_store_id)
-                .values_list("name", flat=True)
-                .first()
+        if not obj.selected_store_id:
+            return None
+        store_names = self.context.get("store_names")
+        if store_names is None:
+            store_names = dict(
+                Store.objects.filter(store_id=obj.selected_store_id).values_list(
+                    "store_id", "name"
+                )
             )
-        return None
+        return store_names.get(obj.selected_store_id)
 
     def to_representation(self, instance: UserList):
         data = super().to_representation(instance)
@@ -16,7 +16,7 @@ from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
-router = DefaultRouter() if settings.DEBUG else SimpleRouter()
+router = SimpleRouter()
 
 router.register("beers", BeerViewSet, basename="beer")
 router.register("countries", CountryViewSet, basename="country")
@@ -34,3 +34,8 @@ urlpatterns = [
     path("patreon/posts/", PatreonPostsView.as_view(), name="patreon-posts"),
     path("", include(router.urls)),
 ]
+
+if settings.DEBUG:
+    api_root = DefaultRouter()
+    api_root.registry.extend(router.registry)
+    urlpatterns.append(path("", api_root.get_api_root_view(), name="api-root"))
@@ -1,16 +1,30 @@
 from __future__ import annotations
 
 import csv
+import io
 import json
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from beers.models import Beer, Country, Tasted, UntappdCheckin
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 CheckinTuple = tuple[int, int, float | None, datetime | None]
-_DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%a, %d %b %Y %H:%M:%S %z")
+BEER_REPRESENTATION_VERSION_KEY = "beer_repr:version"
+_DATETIME_FORMATS = ("%a, %d %b %Y %H:%M:%S %z",)
+_TRUE_TOKENS = frozenset({"true", "t", "1", "yes", "y", "on"})
+_FALSE_TOKENS = frozenset({"false", "f", "0", "no", "n", "off", ""})
 _EMPTY_SYNC_RESULT: dict[str, int] = {"synced_count": 0, "users_affected": 0}
+_BULK_BATCH_SIZE = 1000
+_ITERATOR_CHUNK_SIZE = 2000
+_SYNC_FLUSH_SIZE = 5000
+_TASTED_IMPORT_LOCK_NS = 7301
+_SNIFF_BYTES = 64 * 1024
+_CHECKIN_BEER_COLUMNS = frozenset({"bid", "beer_id", "beer_url"})
 
 
 def parse_bool(val: str | bool) -> bool:
@@ -19,18 +33,35 @@ def parse_bool(val: str | bool) -> bool:
 
     if isinstance(val, str):
         normalized = val.strip().lower()
-        if normalized in ("true", "t", "1", "yes", "y", "on"):
+        if normalized in _TRUE_TOKENS:
             return True
-        if normalized in ("false", "f", "0", "no", "n", "off", ""):
+        if normalized in _FALSE_TOKENS:
             return False
 
     raise ValueError(f"Invalid truth value: {val!r}")
 
 
-def get_or_create_country(country_name: str | None) -> Country | None:
-    if not country_name:
+def beer_representation_version() -> int:
+    return cache.get(BEER_REPRESENTATION_VERSION_KEY, 0)
+
+
+def invalidate_beer_representations() -> None:
+    cache.add(BEER_REPRESENTATION_VERSION_KEY, 0, None)
+    try:
+        cache.incr(BEER_REPRESENTATION_VERSION_KEY)
+    except ValueError:
+        cache.set(BEER_REPRESENTATION_VERSION_KEY, 1, None)
+
+
+def parse_store_id(params) -> int | None:
+    store = params.get("store") or params.get("check_store")
+    if store is None or not store.isdigit():
         return None
+    return int(store)
+
 
+@lru_cache(maxsize=512)
+def _ensure_country(country_name: str) -> str:
     country, created = Country.objects.get_or_create(
         name=country_name, defaults={"iso_code": None}
     )
@@ -38,7 +69,19 @@ def get_or_create_country(country_name: str | None) -> Country | None:
     if created:
         print(f"New country created: {country_name} - needs ISO mapping in admin")
 
-    return country
+    return country.pk
+
+
+@receiver([post_save, post_delete], sender=Country)
+def clear_country_cache(**kwargs) -> None:
+    _ensure_country.cache_clear()
+
+
+def get_or_create_country(country_name: str | None) -> Country | None:
+    if not country_name:
+        return None
+
+    return Country(pk=_ensure_country(country_name))
 
 
 def _parse_checkin_time(raw: str | int | float | None) -> datetime | None:
@@ -51,14 +94,20 @@ def _parse_checkin_time(raw: str | int | float | None) -> datetime | None:
         except (ValueError, OSError):
             return None
 
-    for fmt in _DATETIME_FORMATS:
-        try:
-            dt = datetime.strptime(str(raw).strip(), fmt)
-            return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
-        except ValueError:
-            continue
+    value = str(raw).strip()
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        for fmt in _DATETIME_FORMATS:
+            try:
+                dt = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
 
-    return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
 def _extract_checkin_data(row: dict) -> CheckinTuple | None:
@@ -101,12 +150,15 @@ def parse_untappd_file(uploaded_file) -> list[CheckinTuple] | None:
     filename = uploaded_file.name.lower()
 
     if filename.endswith(".csv"):
-        decoded = uploaded_file.read().decode("utf-8").splitlines()
-        return [
-            data
-            for row in csv.DictReader(decoded)
-            if (data := _extract_checkin_data(row))
-        ]
+        stream = io.TextIOWrapper(uploaded_file, encoding="utf-8", newline="")
+        try:
+            return [
+                data
+                for row in csv.DictReader(stream)
+                if (data := _extract_checkin_data(row))
+            ]
+        finally:
+            stream.detach()
 
     if filename.endswith(".json"):
         data = json.load(uploaded_file)
@@ -117,14 +169,23 @@ def parse_untappd_file(uploaded_file) -> list[CheckinTuple] | None:
     return None
 
 
-def _save_checkins(user: User, checkins: list[CheckinTuple]) -> None:
-    checkin_ids = [c[0] for c in checkins]
-    existing_ids = set(
-        UntappdCheckin.objects.filter(untpd_checkin_id__in=checkin_ids).values_list(
-            "pk", flat=True
-        )
-    )
+def sniff_untappd_file(uploaded_file) -> bool | None:
+    filename = uploaded_file.name.lower()
+    head = uploaded_file.read(_SNIFF_BYTES)
+    uploaded_file.seek(0)
+
+    if filename.endswith(".csv"):
+        first_line = head.split(b"\n", 1)[0].decode("utf-8", errors="replace")
+        header = set(next(csv.reader([first_line]), []))
+        return "checkin_id" in header and bool(header & _CHECKIN_BEER_COLUMNS)
+
+    if filename.endswith(".json"):
+        return head.lstrip()[:1] == b"["
+
+    return None
+
 
+def _save_checkins(user: User, checkins: list[CheckinTuple]) -> None:
     to_create = [
         UntappdCheckin(
             untpd_checkin_id=checkin_id,
@@ -134,41 +195,55 @@ def _save_checkins(user: User, checkins: list[CheckinTuple]) -> None:
             checkin_at=checkin_at,
         )
         for checkin_id, beer_id, rating, checkin_at in checkins
-        if checkin_id not in existing_ids
     ]
     if to_create:
-        UntappdCheckin.objects.bulk_create(to_create, ignore_conflicts=True)
+        UntappdCheckin.objects.bulk_create(
+            to_create, batch_size=_BULK_BATCH_SIZE, ignore_conflicts=True
+        )
 
 
 def _sync_matched_checkins(user: User, beer_ids: set[int]) -> int:
-    untpd_to_beer = {b.untpd_id: b for b in Beer.objects.filter(untpd_id__in=beer_ids)}
-    if not untpd_to_beer:
+    if not beer_ids:
         return 0
 
-    existing_tasted = set(
-        Tasted.objects.filter(
-            user=user, beer__untpd_id__in=untpd_to_beer.keys()
-        ).values_list("beer__untpd_id", flat=True)
-    )
-
-    tasted_to_create = [
-        Tasted(user=user, beer=beer)
-        for uid, beer in untpd_to_beer.items()
-        if uid not in existing_tasted
-    ]
-    if tasted_to_create:
-        Tasted.objects.bulk_create(tasted_to_create)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {Tasted._meta.db_table} (user_id, beer_id) "
+            f"SELECT %s, b.{Beer._meta.pk.column} FROM {Beer._meta.db_table} b "
+            "WHERE b.untpd_id = ANY(%s) "
+            "ON CONFLICT (user_id, beer_id) DO NOTHING",
+            [user.pk, list(beer_ids)],
+        )
+        imported_count = cursor.rowcount
 
     UntappdCheckin.objects.filter(
-        user=user, untpd_beer_id__in=untpd_to_beer.keys()
+        user=user,
+        untpd_beer_id__in=Beer.objects.filter(untpd_id__in=beer_ids).values("untpd_id"),
     ).update(synced=True)
 
-    return len(tasted_to_create)
+    return imported_count
+
+
+def insert_tasted(user: User, beer_id: int) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {Tasted._meta.db_table} (user_id, beer_id) "
+            f"SELECT %s, {Beer._meta.pk.column} FROM {Beer._meta.db_table} "
+            f"WHERE {Beer._meta.pk.column} = %s "
+            "ON CONFLICT (user_id, beer_id) DO NOTHING",
+            [user.pk, beer_id],
+        )
+        return cursor.rowcount == 1
 
 
 def bulk_import_tasted(user: User, checkins: list[CheckinTuple]) -> dict[str, int]:
     beer_ids = {c[1] for c in checkins}
     with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                [_TASTED_IMPORT_LOCK_NS, user.pk],
+            )
         _save_checkins(user, checkins)
         imported_count = _sync_matched_checkins(user, beer_ids)
 
@@ -180,15 +255,21 @@ def bulk_import_tasted(user: User, checkins: list[CheckinTuple]) -> dict[str, in
 
 def sync_unmatched_checkins() -> dict[str, int]:
     unsynced = UntappdCheckin.objects.filter(synced=False)
-    if not unsynced.exists():
+    untpd_ids = set(unsynced.values_list("untpd_beer_id", flat=True).distinct())
+    if not untpd_ids:
         return _EMPTY_SYNC_RESULT
 
-    untpd_ids = set(unsynced.values_list("untpd_beer_id", flat=True))
-    untpd_to_beer = {b.untpd_id: b for b in Beer.objects.filter(untpd_id__in=untpd_ids)}
+    untpd_to_beer = dict(
+        Beer.objects.filter(untpd_id__in=untpd_ids).values_list("untpd_id", "pk")
+    )
     if not untpd_to_beer:
         return _EMPTY_SYNC_RESULT
 
-    matchable = unsynced.filter(untpd_beer_id__in=untpd_to_beer.keys())
+    matchable = (
+        unsynced.filter(untpd_beer_id__in=untpd_to_beer.keys())
+        .values_list("pk", "user_id", "untpd_beer_id")
+        .iterator(chunk_size=_ITERATOR_CHUNK_SIZE)
+    )
 
     existing_tasted = set(
         Tasted.objects.filter(beer__untpd_id__in=untpd_to_beer.keys()).values_list(
@@ -199,26 +280,34 @@ def sync_unmatched_checkins() -> dict[str, int]:
     tasted_to_create: list[Tasted] = []
     users_affected: set[int] = set()
     checkin_pks_to_mark: list[int] = []
+    synced_count = 0
+
+    def flush() -> None:
+        nonlocal synced_count
+        if tasted_to_create:
+            Tasted.objects.bulk_create(tasted_to_create, batch_size=_BULK_BATCH_SIZE)
+            synced_count += len(tasted_to_create)
+            tasted_to_create.clear()
+        if checkin_pks_to_mark:
+            UntappdCheckin.objects.filter(pk__in=checkin_pks_to_mark).update(
+                synced=True
+            )
+            checkin_pks_to_mark.clear()
 
-    for checkin in matchable:
-        key = (checkin.user_id, checkin.untpd_beer_id)
+    for pk, user_id, untpd_beer_id in matchable:
+        key = (user_id, untpd_beer_id)
         if key not in existing_tasted:
             tasted_to_create.append(
-                Tasted(
-                    user_id=checkin.user_id,
-                    beer=untpd_to_beer[checkin.untpd_beer_id],
-                )
+                Tasted(user_id=user_id, beer_id=untpd_to_beer[untpd_beer_id])
             )
             existing_tasted.add(key)
-            users_affected.add(checkin.user_id)
-        checkin_pks_to_mark.append(checkin.pk)
-
-    if tasted_to_create:
-        Tasted.objects.bulk_create(tasted_to_create)
-    if checkin_pks_to_mark:
-        UntappdCheckin.objects.filter(pk__in=checkin_pks_to_mark).update(synced=True)
+            users_affected.add(user_id)
+        checkin_pks_to_mark.append(pk)
+        if len(checkin_pks_to_mark) >= _SYNC_FLUSH_SIZE:
+            flush()
+    flush()
 
     return {
-        "synced_count": len(tasted_to_create),
+        "synced_count": synced_count,
         "users_affected": len(users_affected),
     }
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
 import json as _json
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from functools import lru_cache
+from itertools import islice
 
 from beers.api.filters import (
     BeerFilter,
     NullsAlwaysLastOrderingFilter,
     StockChangeFilter,
 )
-from beers.api.pagination import LargeResultPagination, Pagination
-from beers.api.utils import bulk_import_tasted, parse_untappd_file
+from beers.api.pagination import (
+    CachedCountPagination,
+    LargeResultPagination,
+    Pagination,
+)
+from beers.api.utils import (
+    bulk_import_tasted,
+    insert_tasted,
+    invalidate_beer_representations,
+    parse_bool,
+    parse_store_id,
+    parse_untappd_file,
+    sniff_untappd_file,
+)
 from beers.api.serializers import (
     BeerSerializer,
     CountrySerializer,
@@ -16,6 +32,7 @@ from beers.api.serializers import (
     ListReorderSerializer,
     ReleaseSerializer,
     SharedUserListSerializer,
+    StockChangeBeerSerializer,
     StockChangeSerializer,
     StockSerializer,
     StoreSerializer,
@@ -29,8 +46,10 @@ from beers.api.serializers import (
     UserListSerializer,
     UserListUpdateSerializer,
     WrongMatchSerializer,
+    preload_item_prices,
 )
 from beers.models import (
+    Badge,
     Beer,
     Country,
     FollowedList,
@@ -47,7 +66,9 @@ from beers.models import (
 from beers.patreon import fetch_patreon_posts
 from beers.untappd_lists import fetch_user_lists
 from beers.vmp import VmpApiError, VmpBlockedError, VmpClient
+from config.renderers import ORJSONRenderer
 from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.exceptions import FieldDoesNotExist
 from django.core.cache import cache
 from django.db import models
 from django.db.models import (
@@ -60,15 +81,21 @@ from django.db.models import (
     Prefetch,
     Q,
     QuerySet,
+    Subquery,
     Value,
     When,
 )
-from django.db.models.functions import Greatest
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.files.storage import default_storage
 from django_q.tasks import async_task
-from rest_framework import filters, permissions
+from rest_framework import filters, permissions, serializers
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import action
 from rest_framework.renderers import BrowsableAPIRenderer
@@ -77,22 +104,227 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
 PUBLIC_CACHE_SECONDS = 60 * 15
+BEER_LIST_CACHE_SECONDS = 60
+SHARED_LIST_CACHE_SECONDS = 60 * 5
+STYLES_CACHE_SECONDS = 60 * 5
+ACTIVE_COUNTRIES_CACHE_SECONDS = 60 * 5
+STREAM_CHUNK_SIZE = 2000
+MAX_BEER_IDS = 1000
+BULK_TASTED_SYNC_BYTES = 256 * 1024
 _BARCODE_HIT_TTL = 60 * 60 * 24 * 30
 _BARCODE_MISS_TTL = 60 * 60
 
 
+STOCK_CHANGE_VALUES = [
+    "store",
+    "quantity",
+    "stock_updated",
+    "stocked_at",
+    "unstocked_at",
+]
+STOCK_CHANGE_BEER_VALUES = {
+    field: {
+        "country": "beer__country__name",
+        "country_code": "beer__country__iso_code",
+        "stock": "beer_stock",
+    }.get(field, f"beer__{field}")
+    for field in StockChangeBeerSerializer.Meta.fields
+    if field != "user_tasted"
+}
+STOCK_CHANGE_BEER_ONLY = [
+    field.name
+    for field in Beer._meta.concrete_fields
+    if field.name in StockChangeBeerSerializer.Meta.fields
+] + ["country__iso_code"]
+STOCK_CHANGE_DATETIMES = ("stock_updated", "stocked_at", "unstocked_at")
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _stock_change_row(values: dict, tasted: set[int]) -> dict:
+    row = {field: values[field] for field in STOCK_CHANGE_VALUES}
+    for field in STOCK_CHANGE_DATETIMES:
+        if row[field] is not None:
+            row[field] = _datetime_field.to_representation(row[field])
+    row["beer"] = {
+        field: values[source] for field, source in STOCK_CHANGE_BEER_VALUES.items()
+    }
+    row["beer"]["user_tasted"] = values["beer__vmp_id"] in tasted
+    return row
+
+
+def _stock_change_rows(request, rows: Iterable[dict]) -> list[dict]:
+    rows = list(rows)
+    tasted = _tasted_beer_ids(request, {values["beer__vmp_id"] for values in rows})
+    return [_stock_change_row(values, tasted) for values in rows]
+
+
+def _with_owner_name(queryset: QuerySet[UserList]) -> QuerySet[UserList]:
+    return queryset.annotate(
+        owner_name=Coalesce(
+            NullIf(
+                Trim(Concat("user__first_name", Value(" "), "user__last_name")),
+                Value(""),
+            ),
+            "user__username",
+        )
+    )
+
+
+def _touch_list(user_list: UserList) -> None:
+    UserList.objects.filter(pk=user_list.pk).update(updated_at=timezone.now())
+
+
+def _shared_list_context(user_lists: list[UserList]) -> dict:
+    store_ids = {u.selected_store_id for u in user_lists if u.selected_store_id}
+    return {
+        "store_names": dict(
+            Store.objects.filter(store_id__in=store_ids).values_list("store_id", "name")
+        )
+        if store_ids
+        else {}
+    }
+
+
+def _requested_columns(serializer, model: type[models.Model]) -> list[str]:
+    columns = []
+    for field in serializer.fields.values():
+        if field.source == "*":
+            continue
+        try:
+            model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            continue
+        if isinstance(field, serializers.BaseSerializer):
+            columns.extend(
+                "__".join([field.source, *child.source_attrs])
+                for child in field.fields.values()
+                if child.source != "*"
+            )
+        else:
+            columns.append("__".join(field.source_attrs))
+    return columns
+
+
+def _tasted_beer_ids(request, beer_ids: set[int]) -> set[int]:
+    if not (beer_ids and request.user and request.user.is_authenticated):
+        return set()
+    return set(
+        Tasted.objects.filter(user=request.user, beer_id__in=beer_ids).values_list(
+            "beer_id", flat=True
+        )
+    )
+
+
+def _parse_beer_ids(beers: str) -> list[int]:
+    try:
+        beer_ids = list(set(map(int, beers.split(","))))
+    except ValueError:
+        raise serializers.ValidationError({"beers": "Expected comma-separated ids"})
+    if len(beer_ids) > MAX_BEER_IDS:
+        raise serializers.ValidationError(
+            {"beers": f"At most {MAX_BEER_IDS} ids are allowed"}
+        )
+    return beer_ids
+
+
+def _wants_stream(request) -> bool:
+    stream = request.query_params.get("stream")
+    return bool(stream and parse_bool(stream))
+
+
+def _chunked(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _stream_json(chunks: Iterable[list[dict]]) -> StreamingHttpResponse:
+    renderer = ORJSONRenderer()
+
+    def generate() -> Iterator[bytes]:
+        yield b"["
+        separator = b""
+        for rows in chunks:
+            for row in rows:
+                yield separator + renderer.render(row)
+                separator = b","
+        yield b"]"
+
+    return StreamingHttpResponse(generate(), content_type="application/json")
+
+
+def _user_tasted_prefetch(request) -> list[Prefetch]:
+    if not (request.user and request.user.is_authenticated):
+        return []
+    return [
+        Prefetch(
+            "tasted_set",
+            queryset=Tasted.objects.filter(user=request.user).only("beer_id"),
+            to_attr="_user_tasted",
+        )
+    ]
+
+
+def _all_stock_prefetch(request) -> list[Prefetch]:
+    all_stock = request.query_params.get("all_stock")
+    if not (all_stock and parse_bool(all_stock)):
+        return []
+    return [
+        Prefetch(
+            "stock_set",
+            queryset=Stock.objects.exclude(quantity=0)
+            .select_related("store")
+            .only(
+                "beer_id",
+                "quantity",
+                "store__name",
+                "store__gps_lat",
+                "store__gps_long",
+            ),
+            to_attr="active_stock",
+        )
+    ]
+
+
+def _store_quantity(request, beer_ref: str) -> Subquery | Value:
+    store_id = parse_store_id(request.query_params)
+    if store_id is None:
+        return Value(None, output_field=models.IntegerField())
+    return Subquery(
+        Stock.objects.filter(beer=OuterRef(beer_ref), store_id=store_id).values(
+            "quantity"
+        )[:1]
+    )
+
+
+def _wants_browsable(request) -> bool:
+    if request.GET.get("format") == BrowsableAPIRenderer.format:
+        return True
+    return BrowsableAPIRenderer.media_type in request.META.get("HTTP_ACCEPT", "")
+
+
+@lru_cache(maxsize=None)
+def _renderer_instances(renderer_classes: tuple[type, ...]) -> tuple:
+    return tuple(renderer() for renderer in renderer_classes)
+
+
 class BrowsableMixin:
-    def get_renderers(self) -> list:
-        renderers = list(getattr(self, "renderer_classes", []))
+    def get_renderers(self) -> Sequence:
+        renderers = _renderer_instances(tuple(self.renderer_classes))
         request = getattr(self, "request", None)
-        if request and getattr(request, "user", None) and request.user.is_authenticated:
-            renderers.append(BrowsableAPIRenderer)
-        return [renderer() for renderer in renderers]
+        if (
+            request is not None
+            and _wants_browsable(request)
+            and request.user.is_authenticated
+        ):
+            return [*renderers, BrowsableAPIRenderer()]
+        return renderers
 
 
 class BeerViewSet(BrowsableMixin, ModelViewSet):
     serializer_class = BeerSerializer
-    pagination_class = LargeResultPagination
+    pagination_class = CachedCountPagination
     permission_classes = [permissions.DjangoModelPermissionsOrAnonReadOnly]
     filter_backends = (
         filters.SearchFilter,
@@ -123,28 +355,67 @@ class BeerViewSet(BrowsableMixin, ModelViewSet):
     filterset_class = BeerFilter
 
     def get_queryset(self) -> QuerySet[Beer]:
-        queryset = Beer.objects.all()
-        queryset = queryset.select_related("country", "brewery").prefetch_related(
-            "badge_set",
-            Prefetch("stock_set", queryset=Stock.objects.select_related("store")),
+        params = getattr(self.request, "query_params", {})
+        serializer = None
+        if self.request.method == "GET" and self.action in ("list", "retrieve"):
+            serializer = self.get_serializer()
+
+        prefetches = []
+        if serializer is None or "badges" in serializer.fields:
+            prefetches.append(
+                Prefetch("badge_set", queryset=Badge.objects.only("beer_id", "text"))
+            )
+        if serializer is None or "all_stock" in serializer.fields:
+            prefetches.extend(_all_stock_prefetch(self.request))
+        if serializer is None or "user_tasted" in serializer.fields:
+            prefetches.extend(_user_tasted_prefetch(self.request))
+
+        queryset = Beer.objects.select_related("country", "brewery").prefetch_related(
+            *prefetches
         )
 
-        if self.request.user and self.request.user.is_authenticated:
-            queryset = queryset.annotate(
-                user_tasted=Exists(
-                    Tasted.objects.filter(user=self.request.user, beer=OuterRef("pk"))
-                )
-            )
-        else:
-            queryset = queryset.annotate(user_tasted=Value(False))
+        queryset = queryset.annotate(store_quantity=_store_quantity(self.request, "pk"))
 
-        beers = getattr(self.request, "query_params", {}).get("beers")
+        beers = params.get("beers")
         if beers is not None:
-            beer_ids = [int(v) for v in beers.split(",")]
-            queryset = queryset.filter(vmp_id__in=beer_ids)
+            queryset = queryset.filter(vmp_id__in=_parse_beer_ids(beers))
+
+        if serializer is not None:
+            columns = _requested_columns(serializer, Beer)
+            relations = {c.split("__")[0] for c in columns if "__" in c}
+            queryset = (
+                queryset.select_related(None)
+                .select_related(*relations)
+                .only(*columns, "vmp_updated", "untpd_updated", "vmp_details_fetched")
+            )
 
         return queryset
 
+    def perform_update(self, serializer) -> None:
+        super().perform_update(serializer)
+        invalidate_beer_representations()
+
+    def perform_destroy(self, instance: Beer) -> None:
+        super().perform_destroy(instance)
+        invalidate_beer_representations()
+
+    @method_decorator(cache_page(BEER_LIST_CACHE_SECONDS))
+    @method_decorator(vary_on_headers("Authorization", "Cookie", "X-Api-Key"))
+    def list(self, request, *args, **kwargs):
+        if _wants_stream(request):
+            beers = self.filter_queryset(self.get_queryset()).iterator(
+                chunk_size=STREAM_CHUNK_SIZE
+            )
+            response = _stream_json(
+                self.get_serializer(chunk, many=True).data
+                for chunk in _chunked(beers, STREAM_CHUNK_SIZE)
+            )
+        else:
+            response = super().list(request, *args, **kwargs)
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True)
+        return response
+
     @action(detail=False, methods=["get"], url_path="barcode")
     def barcode(self, request):
         code = (request.query_params.get("code") or "").strip()
@@ -179,14 +450,18 @@ class BeerViewSet(BrowsableMixin, ModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="styles")
     def styles(self, request):
-        styles = (
-            Beer.objects.filter(active=True, style__isnull=False)
-            .exclude(style="")
-            .values_list("style", flat=True)
-            .distinct()
-            .order_by("style")
+        def load() -> list[str]:
+            return list(
+                Beer.objects.filter(active=True, style__isnull=False)
+                .exclude(style="")
+                .values_list("style", flat=True)
+                .distinct()
+                .order_by("style")
+            )
+
+        return Response(
+            cache.get_or_set("beer_styles:active", load, STYLES_CACHE_SECONDS)
         )
-        return Response(list(styles))
 
     @action(
         detail=True,
@@ -194,16 +469,16 @@ class BeerViewSet(BrowsableMixin, ModelViewSet):
         permission_classes=[permissions.IsAuthenticated],
     )
     def mark_tasted(self, request, pk=None):
-        beer = self.get_object()
-
         if request.method == "POST":
-            _tasted, created = Tasted.objects.get_or_create(
-                user=request.user, beer=beer
-            )
-            if created:
+            if not str(pk).isdigit():
+                raise Http404
+            if insert_tasted(request.user, int(pk)):
                 return Response({"status": "marked as tasted"}, status=201)
+            if not Beer.objects.filter(pk=pk).exists():
+                raise Http404
             return Response({"status": "already marked as tasted"}, status=200)
 
+        beer = self.get_object()
         deleted_count, _ = Tasted.objects.filter(user=request.user, beer=beer).delete()
         if deleted_count > 0:
             return Response({"status": "removed from tasted"}, status=204)
@@ -219,6 +494,30 @@ class BeerViewSet(BrowsableMixin, ModelViewSet):
         if not uploaded_file:
             return Response({"error": "No file provided"}, status=400)
 
+        if uploaded_file.size > BULK_TASTED_SYNC_BYTES:
+            looks_valid = sniff_untappd_file(uploaded_file)
+            if looks_valid is None:
+                return Response(
+                    {"error": "Unsupported file format. Use .csv or .json"}, status=400
+                )
+            if not looks_valid:
+                return Response({"error": "Failed to parse file"}, status=400)
+            suffix = uploaded_file.name.lower().rsplit(".", 1)[-1]
+            storage_key = default_storage.save(
+                f"tasted_imports/{request.user.pk}/{uuid.uuid4().hex}.{suffix}",
+                uploaded_file,
+            )
+            task_id = async_task(
+                "beers.tasks.bulk_import_tasted_task", request.user.pk, storage_key
+            )
+            return Response(
+                {
+                    "job_id": task_id,
+                    "message": "Importing check-ins in the background",
+                },
+                status=202,
+            )
+
         try:
             checkins = parse_untappd_file(uploaded_file)
         except Exception:
@@ -251,21 +550,16 @@ class StockChangeViewSet(BrowsableMixin, ModelViewSet):
     filterset_class = StockChangeFilter
 
     def get_queryset(self) -> QuerySet[Stock]:
-        beer_qs = Beer.objects.all()
-        if self.request.user and self.request.user.is_authenticated:
-            beer_qs = beer_qs.annotate(
-                user_tasted=Exists(
-                    Tasted.objects.filter(user=self.request.user, beer=OuterRef("pk"))
-                )
-            )
-        else:
-            beer_qs = beer_qs.annotate(user_tasted=Value(False))
+        beer_qs = (
+            Beer.objects.select_related("country")
+            .only(*STOCK_CHANGE_BEER_ONLY)
+            .annotate(store_quantity=_store_quantity(self.request, "pk"))
+            .prefetch_related(*_user_tasted_prefetch(self.request))
+        )
 
         return (
-            Stock.objects.all()
-            .exclude(Q(stocked_at=None) & Q(unstocked_at=None))
-            .annotate(stock_unstock_at=Greatest("stocked_at", "unstocked_at"))
-            .select_related("store")
+            Stock.objects.filter(stock_unstock_at__isnull=False)
+            .only(*STOCK_CHANGE_VALUES, "beer")
             .prefetch_related(Prefetch("beer", queryset=beer_qs))
             .order_by(
                 F("stock_unstock_at__date").desc(),
@@ -274,6 +568,24 @@ class StockChangeViewSet(BrowsableMixin, ModelViewSet):
             )
         )
 
+    def list(self, request, *args, **kwargs):
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .annotate(beer_stock=_store_quantity(request, "beer"))
+            .values(*STOCK_CHANGE_VALUES, *STOCK_CHANGE_BEER_VALUES.values())
+        )
+        if _wants_stream(request):
+            rows = queryset.iterator(chunk_size=STREAM_CHUNK_SIZE)
+            return _stream_json(
+                _stock_change_rows(request, chunk)
+                for chunk in _chunked(rows, STREAM_CHUNK_SIZE)
+            )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(_stock_change_rows(request, page))
+        return Response(_stock_change_rows(request, queryset))
+
 
 class StoreViewSet(BrowsableMixin, ModelViewSet):
     queryset = Store.objects.all().order_by("name", "store_id")
@@ -315,44 +627,49 @@ class ReleaseViewSet(BrowsableMixin, ModelViewSet):
 
     def get_queryset(self) -> QuerySet[Release]:
         qs = Release.objects.filter(active=True).order_by("-release_date", "pk")
-        if self.action in ("list", "retrieve"):
-            qs = qs.annotate(
-                product_count=Count("beer", distinct=True),
-                beer_count=Count(
-                    "beer", filter=Q(beer__main_category__iexact="Øl"), distinct=True
-                ),
+        if self.action not in ("list", "retrieve"):
+            return qs
+        fields = self.get_serializer().fields
+        annotations = {}
+        if "beer_count" in fields or "product_stats" in fields:
+            annotations.update(
+                product_count=Count("beer"),
+                beer_count=Count("beer", filter=Q(beer__main_category__iexact="Øl")),
                 cider_count=Count(
-                    "beer", filter=Q(beer__main_category__iexact="Sider"), distinct=True
-                ),
-                mead_count=Count(
-                    "beer", filter=Q(beer__main_category__iexact="Mjød"), distinct=True
+                    "beer", filter=Q(beer__main_category__iexact="Sider")
                 ),
-                product_selections=ArrayAgg("beer__product_selection", distinct=True),
+                mead_count=Count("beer", filter=Q(beer__main_category__iexact="Mjød")),
             )
-        return qs
+        if "product_selections" in fields:
+            annotations["product_selections"] = ArrayAgg(
+                "beer__product_selection", distinct=True
+            )
+        return qs.annotate(**annotations) if annotations else qs
 
     @action(detail=True, methods=["get"], url_path="countries")
     def countries(self, request, pk=None):
         release = self.get_object()
         countries = (
-            Country.objects.filter(beers__in=release.beer.all())
-            .distinct()
-            .order_by("name")
+            Country.objects.filter(beers__release=release).distinct().order_by("name")
         )
         serializer = CountrySerializer(countries, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=["get"], url_path="styles")
     def styles(self, request, pk=None):
-        release = self.get_object()
-        styles = (
-            release.beer.filter(style__isnull=False)
-            .exclude(style="")
-            .values_list("style", flat=True)
-            .distinct()
-            .order_by("style")
+        def load() -> list[str]:
+            return list(
+                self.get_object()
+                .beer.filter(style__isnull=False)
+                .exclude(style="")
+                .values_list("style", flat=True)
+                .distinct()
+                .order_by("style")
+            )
+
+        return Response(
+            cache.get_or_set(f"release_styles:{pk}", load, STYLES_CACHE_SECONDS)
         )
-        return Response(list(styles))
 
 
 @method_decorator(cache_page(PUBLIC_CACHE_SECONDS), name="dispatch")
@@ -368,11 +685,15 @@ class CountryViewSet(BrowsableMixin, ModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="active")
     def active(self, request):
-        countries = (
-            Country.objects.filter(beers__active=True).distinct().order_by("name")
+        def load() -> list[dict]:
+            countries = Country.objects.filter(
+                Exists(Beer.objects.filter(country=OuterRef("pk"), active=True))
+            ).order_by("name")
+            return self.get_serializer(countries, many=True).data
+
+        return Response(
+            cache.get_or_set("countries:active", load, ACTIVE_COUNTRIES_CACHE_SECONDS)
         )
-        serializer = self.get_serializer(countries, many=True)
-        return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="unmapped")
     def unmapped(self, request):
@@ -411,11 +732,14 @@ class UserListViewSet(BrowsableMixin, ModelViewSet):
         return context
 
     def get_queryset(self) -> QuerySet[UserList]:
-        return (
+        queryset = (
             UserList.objects.filter(user=self.request.user)
             .select_related("untappd_list")
             .prefetch_related("items")
         )
+        if self.action == "share":
+            queryset = _with_owner_name(queryset)
+        return queryset
 
     def list(self, request, *args, **kwargs):
         owned = self.get_queryset()
@@ -425,23 +749,27 @@ class UserListViewSet(BrowsableMixin, ModelViewSet):
             for item in UserListSerializer(owned, many=True, context=context).data
         ]
 
-        followed_entries = FollowedList.objects.filter(user=request.user)
+        followed_entries = list(FollowedList.objects.filter(user=request.user))
+        followed_lists = {
+            user_list.share_token: user_list
+            for user_list in _with_owner_name(
+                UserList.objects.filter(
+                    share_token__in=[entry.share_token for entry in followed_entries]
+                )
+            )
+            .select_related("untappd_list")
+            .prefetch_related("items")
+        }
+        preload_item_prices(list(followed_lists.values()))
         followed_data = []
         max_sort = max((item["sort_order"] for item in owned_data), default=0)
         for i, entry in enumerate(followed_entries):
-            user_list = (
-                UserList.objects.filter(share_token=entry.share_token)
-                .select_related("untappd_list", "user")
-                .prefetch_related("items")
-                .first()
-            )
+            user_list = followed_lists.get(uuid.UUID(entry.share_token))
             if user_list:
                 item = dict(UserListSerializer(user_list, context=context).data)
                 item["is_followed"] = True
                 item["sort_order"] = max_sort + 1 + i
-                item["user_name"] = (
-                    user_list.user.get_full_name() or user_list.user.username
-                )
+                item["user_name"] = user_list.owner_name
                 followed_data.append(item)
 
         return Response(owned_data + followed_data)
@@ -467,7 +795,9 @@ class UserListViewSet(BrowsableMixin, ModelViewSet):
     @action(detail=True, methods=["get"], url_path="share")
     def share(self, request, pk=None):
         user_list = self.get_object()
-        serializer = SharedUserListSerializer(user_list)
+        serializer = SharedUserListSerializer(
+            user_list, context=_shared_list_context([user_list])
+        )
         return Response(serializer.data)
 
     @action(
@@ -477,11 +807,30 @@ class UserListViewSet(BrowsableMixin, ModelViewSet):
         permission_classes=[permissions.AllowAny],
     )
     def shared(self, request, token: str | None = None):
-        user_list = UserList.objects.filter(share_token=token).first()
-        if not user_list:
+        version = (
+            UserList.objects.filter(share_token=token)
+            .values_list("updated_at", "untappd_list__last_synced")
+            .first()
+        )
+        if not version:
             return Response(status=404)
-        serializer = SharedUserListSerializer(user_list)
-        return Response(serializer.data)
+        stamps = ":".join(str(v.timestamp()) if v else "-" for v in version)
+        key = f"shared_list:{token}:{stamps}"
+        data = cache.get(key)
+        if data is None:
+            user_list = (
+                _with_owner_name(UserList.objects.filter(share_token=token))
+                .select_related("untappd_list")
+                .prefetch_related("items")
+                .first()
+            )
+            if not user_list:
+                return Response(status=404)
+            data = SharedUserListSerializer(
+                user_list, context=_shared_list_context([user_list])
+            ).data
+            cache.set(key, data, SHARED_LIST_CACHE_SECONDS)
+        return Response(data)
 
     @action(
         detail=False,
@@ -520,12 +869,24 @@ class UserListViewSet(BrowsableMixin, ModelViewSet):
         serializer = UserListItemCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         product_id = serializer.validated_data["product_id"]
-        if not Beer.objects.filter(vmp_id=product_id).exists():
+        items = UserListItem.objects.filter(list=user_list).order_by()
+        target = (
+            Beer.objects.filter(vmp_id=product_id)
+            .annotate(
+                in_list=Exists(items.filter(product_id=product_id)),
+                max_order=Subquery(
+                    items.values("list").annotate(m=Max("sort_order")).values("m")
+                ),
+            )
+            .values("in_list", "max_order")
+            .first()
+        )
+        if target is None:
             return Response({"error": "Product not found"}, status=404)
-        if UserListItem.objects.filter(list=user_list, product_id=product_id).exists():
+        if target["in_list"]:
             return Response({"error": "Product already in list"}, status=409)
-        max_order = user_list.items.aggregate(m=Max("sort_order"))["m"] or 0
-        serializer.save(list=user_list, sort_order=max_order + 1)
+        serializer.save(list=user_list, sort_order=(target["max_order"] or 0) + 1)
+        _touch_list(user_list)
         return Response(UserListItemSerializer(serializer.instance).data, status=201)
 
     @action(
@@ -544,10 +905,12 @@ class UserListViewSet(BrowsableMixin, ModelViewSet):
             return Response(status=404)
         if request.method == "DELETE":
             item.delete()
+            _touch_list(user_list)
             return Response(status=204)
         serializer = UserListItemUpdateSerializer(item, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        _touch_list(user_list)
         return Response(UserListItemSerializer(serializer.instance).data)
 
     @action(
@@ -565,6 +928,7 @@ class UserListViewSet(BrowsableMixin, ModelViewSet):
         if not item:
             return Response(status=404)
         item.delete()
+        _touch_list(user_list)
         return Response(status=204)
 
     @action(detail=False, methods=["post", "patch"], url_path="reorder")
@@ -592,6 +956,7 @@ class UserListViewSet(BrowsableMixin, ModelViewSet):
         UserListItem.objects.filter(pk__in=item_ids, list=user_list).update(
             sort_order=Case(*cases, output_field=models.IntegerField())
         )
+        _touch_list(user_list)
         return Response(status=204)
 
 
@@ -6,6 +6,7 @@ from typing import Any
 
 from beers.models import VmpNotReleased
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from django_q.models import Schedule
 
@@ -25,23 +26,28 @@ class Command(BaseCommand):
         badge_type = options["badge_type"]
         days = options["days"]
 
-        created_count = self._create_unreleased_products(products)
-        self._schedule_tasks(
-            name, products, badge_text, badge_type, days, created_count
-        )
+        with transaction.atomic():
+            created_count, product_count = self._create_unreleased_products(products)
+            self._schedule_tasks(
+                name, products, badge_text, badge_type, days, product_count
+            )
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Created {created_count} unreleased products and scheduled tasks"
+                f"Created {created_count} of {product_count} unreleased products and scheduled tasks"
             )
         )
 
-    def _create_unreleased_products(self, products: str) -> int:
-        created_count = 0
-        for product_id in products.split(","):
-            VmpNotReleased.objects.create(id=int(product_id.strip()))
-            created_count += 1
-        return created_count
+    def _create_unreleased_products(self, products: str) -> tuple[int, int]:
+        product_ids = {int(product_id.strip()) for product_id in products.split(",")}
+        existing = VmpNotReleased.objects.filter(id__in=product_ids)
+        before = existing.count()
+        VmpNotReleased.objects.bulk_create(
+            [VmpNotReleased(id=product_id) for product_id in product_ids],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        return existing.count() - before, len(product_ids)
 
     def _schedule_tasks(
         self,
@@ -50,27 +56,31 @@ class Command(BaseCommand):
         badge_text: str,
         badge_type: str,
         days: int,
-        created_count: int,
+        product_count: int,
     ) -> None:
         now = timezone.now()
 
-        self._schedule_get_beers_task(badge_text, now)
-        self._schedule_release_model_task(name, products, badge_text, now)
-        self._schedule_badges_tasks(products, badge_text, badge_type, days, now)
-        self._schedule_untappd_updates(badge_text, created_count, now)
+        Schedule.objects.bulk_create(
+            [
+                self._get_beers_schedule(badge_text, now),
+                self._release_model_schedule(name, products, badge_text, now),
+                *self._badges_schedules(products, badge_text, badge_type, days, now),
+                self._untappd_updates_schedule(badge_text, product_count, now),
+            ]
+        )
 
-    def _schedule_get_beers_task(self, badge_text: str, now) -> None:
-        Schedule.objects.create(
+    def _get_beers_schedule(self, badge_text: str, now) -> Schedule:
+        return Schedule(
             name=f"Release: {badge_text} - Get beers from vmp",
             func="beers.tasks.get_unreleased_beers_from_vmp",
             schedule_type=Schedule.ONCE,
             next_run=now,
         )
 
-    def _schedule_release_model_task(
+    def _release_model_schedule(
         self, name: str, products: str, badge_text: str, now
-    ) -> None:
-        Schedule.objects.create(
+    ) -> Schedule:
+        return Schedule(
             name=f"Release: {badge_text} - Add release model",
             func="beers.tasks.create_release",
             kwargs=f"products='{products}', name='{name}'",
@@ -78,32 +88,33 @@ class Command(BaseCommand):
             next_run=now + timedelta(minutes=10),
         )
 
-    def _schedule_badges_tasks(
+    def _badges_schedules(
         self, products: str, badge_text: str, badge_type: str, days: int, now
-    ) -> None:
-        Schedule.objects.create(
-            name=f"Release: {badge_text} - Add badges",
-            func="beers.tasks.create_badges_custom",
-            kwargs=f"products='{products}', badge_text='{badge_text}', badge_type='{badge_type}'",
-            schedule_type=Schedule.ONCE,
-            next_run=now + timedelta(minutes=10),
-        )
-
-        Schedule.objects.create(
-            name=f"Release: {badge_text} - Remove badges",
-            func="beers.tasks.remove_badges",
-            kwargs=f"badge_type='{badge_type}'",
-            schedule_type=Schedule.ONCE,
-            next_run=now + timedelta(days=days),
-        )
+    ) -> list[Schedule]:
+        return [
+            Schedule(
+                name=f"Release: {badge_text} - Add badges",
+                func="beers.tasks.create_badges_custom",
+                kwargs=f"products='{products}', badge_text='{badge_text}', badge_type='{badge_type}'",
+                schedule_type=Schedule.ONCE,
+                next_run=now + timedelta(minutes=10),
+            ),
+            Schedule(
+                name=f"Release: {badge_text} - Remove badges",
+                func="beers.tasks.remove_badges",
+                kwargs=f"badge_type='{badge_type}'",
+                schedule_type=Schedule.ONCE,
+                next_run=now + timedelta(days=days),
+            ),
+        ]
 
-    def _schedule_untappd_updates(
-        self, badge_text: str, created_count: int, now
-    ) -> None:
-        Schedule.objects.create(
+    def _untappd_updates_schedule(
+        self, badge_text: str, product_count: int, now
+    ) -> Schedule:
+        return Schedule(
             name=f"Release: {badge_text} - Update Untappd",
             func="beers.tasks.update_beers_from_untappd",
-            kwargs=f"calls={created_count}",
+            kwargs=f"calls={product_count}",
             schedule_type=Schedule.ONCE,
             next_run=now + timedelta(minutes=5),
         )
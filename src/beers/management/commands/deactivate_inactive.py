@@ -4,6 +4,7 @@ from argparse import ArgumentParser
 from datetime import timedelta
 from typing import Any
 
+from beers.api.utils import invalidate_beer_representations
 from beers.models import Beer, Stock
 from django.core.management.base import BaseCommand
 from django.utils import timezone
@@ -37,6 +38,8 @@ class Command(BaseCommand):
 
     def _deactivate_beers(self, beers) -> int:
         updated_count = beers.update(active=False)
+        if updated_count:
+            invalidate_beer_representations()
         return updated_count
 
     def _unstock_beers(self, beers) -> int:
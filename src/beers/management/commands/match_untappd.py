@@ -4,6 +4,7 @@ import time
 from argparse import ArgumentParser
 
 import cloudscraper25
+from beers.api.utils import invalidate_beer_representations
 from beers.models import Beer
 from bs4 import BeautifulSoup
 from django.core.management.base import BaseCommand
@@ -52,6 +53,8 @@ class Command(BaseCommand):
                 else:
                     self.stdout.write(self.style.ERROR(f"Failed to match {beer}..."))
 
+        if matched or failed:
+            invalidate_beer_representations()
         self.stdout.write(self.style.SUCCESS(f"Matched: {matched} Failed: {failed}"))
 
     def _process_beer(
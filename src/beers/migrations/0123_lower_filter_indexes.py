@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-15 06:21
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("beers", "0122_clean_brewery"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                django.db.models.functions.text.Lower("product_selection"),
+                name="beer_product_sel_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                django.db.models.functions.text.Lower("country"),
+                name="beer_country_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="release",
+            index=models.Index(
+                django.db.models.functions.text.Lower("name"),
+                name="release_name_lower_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 06:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("beers", "0123_lower_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="stock",
+            index=models.Index(
+                condition=models.Q(("quantity", 0), _negated=True),
+                fields=["store", "beer"],
+                name="stock_in_store_idx",
+            ),
+        ),
+    ]
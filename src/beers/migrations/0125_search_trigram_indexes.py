@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-15 06:26
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("beers", "0124_stock_in_store_idx"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(fields=["untpd_id"], name="beer_untpd_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("vmp_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="beer_vmp_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("vmp_brewery"),
+                    name="gin_trgm_ops",
+                ),
+                name="beer_vmp_brewery_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("style"), name="gin_trgm_ops"
+                ),
+                name="beer_style_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("sub_category"),
+                    name="gin_trgm_ops",
+                ),
+                name="beer_sub_category_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brewery",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="brewery_name_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-15 06:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("beers", "0125_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                models.OrderBy(models.F("rating"), descending=True, nulls_last=True),
+                models.OrderBy(models.F("vmp_name")),
+                models.OrderBy(models.F("vmp_id")),
+                name="beer_rating_nl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("value_score"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("vmp_name")),
+                models.OrderBy(models.F("vmp_id")),
+                name="beer_value_score_nl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                models.OrderBy(models.F("checkins"), descending=True, nulls_last=True),
+                models.OrderBy(models.F("vmp_name")),
+                models.OrderBy(models.F("vmp_id")),
+                name="beer_checkins_nl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("created_at"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("vmp_name")),
+                models.OrderBy(models.F("vmp_id")),
+                name="beer_created_at_nl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                models.OrderBy(models.F("abv"), descending=True, nulls_last=True),
+                models.OrderBy(models.F("vmp_name")),
+                models.OrderBy(models.F("vmp_id")),
+                name="beer_abv_nl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                models.OrderBy(models.F("price"), nulls_last=True),
+                models.OrderBy(models.F("vmp_name")),
+                models.OrderBy(models.F("vmp_id")),
+                name="beer_price_nl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                models.OrderBy(models.F("price_per_volume"), nulls_last=True),
+                models.OrderBy(models.F("vmp_name")),
+                models.OrderBy(models.F("vmp_id")),
+                name="beer_ppv_nl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beer",
+            index=models.Index(
+                models.OrderBy(models.F("price_per_alcohol_unit"), nulls_last=True),
+                models.OrderBy(models.F("vmp_name")),
+                models.OrderBy(models.F("vmp_id")),
+                name="beer_ppau_nl_idx",
+            ),
+        ),
+    ]
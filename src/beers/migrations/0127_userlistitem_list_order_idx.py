@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("beers", "0126_beer_nulls_last_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userlistitem",
+            index=models.Index(
+                fields=["list", "sort_order", "created_at"],
+                name="userlistitem_list_order_idx",
+            ),
+        ),
+    ]
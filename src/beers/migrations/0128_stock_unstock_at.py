@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-15 07:19
+
+from django.db import migrations, models
+from django.db.models.functions import Greatest, TruncDate
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("beers", "0127_userlistitem_list_order_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stock",
+            name="stock_unstock_at",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=Greatest("stocked_at", "unstocked_at"),
+                output_field=models.DateTimeField(blank=True, null=True),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="stock",
+            index=models.Index(
+                models.OrderBy(TruncDate("stock_unstock_at"), descending=True),
+                models.OrderBy(
+                    models.F("stocked_at"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("id")),
+                condition=models.Q(("stock_unstock_at__isnull", False)),
+                name="stock_change_order_idx",
+            ),
+        ),
+    ]
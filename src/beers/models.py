@@ -3,9 +3,11 @@ import uuid
 
 import requests
 from dirtyfields import DirtyFieldsMixin
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MaxValueValidator, MinValueValidator, URLValidator
 from django.db import models
 from django.db.models.deletion import CASCADE
+from django.db.models.functions import Greatest, Lower, TruncDate, Upper
 
 logger = logging.getLogger(__name__)
 
@@ -44,11 +46,27 @@ class Brewery(models.Model):
 
     class Meta:
         verbose_name_plural = "Breweries"
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="brewery_name_trgm",
+            ),
+        ]
 
     def __str__(self):
         return self.name or self.untpd_url
 
 
+def _nulls_last_index(field: str, descending: bool, name: str) -> models.Index:
+    column = models.F(field)
+    ordering = (
+        column.desc(nulls_last=True) if descending else column.asc(nulls_last=True)
+    )
+    return models.Index(
+        ordering, models.F("vmp_name").asc(), models.F("vmp_id").asc(), name=name
+    )
+
+
 class Beer(DirtyFieldsMixin, models.Model):
     # Vinmonopolet info
     vmp_id = models.BigIntegerField(primary_key=True)
@@ -133,6 +151,37 @@ class Beer(DirtyFieldsMixin, models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(Lower("product_selection"), name="beer_product_sel_lower_idx"),
+            models.Index(Lower("country"), name="beer_country_lower_idx"),
+            models.Index(fields=["untpd_id"], name="beer_untpd_id_idx"),
+            GinIndex(
+                OpClass(Upper("vmp_name"), name="gin_trgm_ops"),
+                name="beer_vmp_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("vmp_brewery"), name="gin_trgm_ops"),
+                name="beer_vmp_brewery_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("style"), name="gin_trgm_ops"),
+                name="beer_style_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("sub_category"), name="gin_trgm_ops"),
+                name="beer_sub_category_trgm",
+            ),
+            _nulls_last_index("rating", True, "beer_rating_nl_idx"),
+            _nulls_last_index("value_score", True, "beer_value_score_nl_idx"),
+            _nulls_last_index("checkins", True, "beer_checkins_nl_idx"),
+            _nulls_last_index("created_at", True, "beer_created_at_nl_idx"),
+            _nulls_last_index("abv", True, "beer_abv_nl_idx"),
+            _nulls_last_index("price", False, "beer_price_nl_idx"),
+            _nulls_last_index("price_per_volume", False, "beer_ppv_nl_idx"),
+            _nulls_last_index("price_per_alcohol_unit", False, "beer_ppau_nl_idx"),
+        ]
+
     def _compute_price_per_volume(self) -> float | None:
         if self.price and self.volume:
             return self.price / self.volume
@@ -245,9 +294,28 @@ class Stock(models.Model):
     last_seen_in_stock_sync = models.DateTimeField(blank=True, null=True)
     stocked_at = models.DateTimeField(blank=True, null=True)
     unstocked_at = models.DateTimeField(blank=True, null=True)
+    stock_unstock_at = models.GeneratedField(
+        expression=Greatest("stocked_at", "unstocked_at"),
+        output_field=models.DateTimeField(blank=True, null=True),
+        db_persist=True,
+    )
 
     class Meta:
         unique_together = [["store", "beer"]]
+        indexes = [
+            models.Index(
+                fields=["store", "beer"],
+                condition=~models.Q(quantity=0),
+                name="stock_in_store_idx",
+            ),
+            models.Index(
+                TruncDate("stock_unstock_at").desc(),
+                models.F("stocked_at").desc(nulls_last=True),
+                models.F("id").asc(),
+                condition=models.Q(stock_unstock_at__isnull=False),
+                name="stock_change_order_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.beer.vmp_name
@@ -301,6 +369,10 @@ class WrongMatch(models.Model):
             self.beer.match_manually = False
             self.beer.save()
 
+            from beers.api.utils import invalidate_beer_representations
+
+            invalidate_beer_representations()
+
             self.delete()
 
         elif self.accept_change and suggested_url == self.beer.untpd_url:
@@ -338,6 +410,11 @@ class Release(models.Model):
     product_selection = models.CharField(max_length=150, blank=True, null=True)
     is_christmas_release = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(Lower("name"), name="release_name_lower_idx"),
+        ]
+
 
 class Tasted(models.Model):
     user = models.ForeignKey("auth.User", on_delete=CASCADE)
@@ -433,6 +510,12 @@ class UserListItem(models.Model):
     class Meta:
         unique_together = ["list", "product_id"]
         ordering = ["sort_order", "created_at"]
+        indexes = [
+            models.Index(
+                fields=["list", "sort_order", "created_at"],
+                name="userlistitem_list_order_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.list.name} - {self.product_id}"
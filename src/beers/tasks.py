@@ -163,6 +163,19 @@ def sync_untappd_list_task(untappd_list_pk: int) -> int:
     return sync_untappd_list(untappd_list)
 
 
+def bulk_import_tasted_task(user_pk: int, storage_key: str) -> dict[str, int]:
+    from beers.api.utils import bulk_import_tasted, parse_untappd_file
+    from django.contrib.auth.models import User
+    from django.core.files.storage import default_storage
+
+    try:
+        with default_storage.open(storage_key, "rb") as uploaded_file:
+            checkins = parse_untappd_file(uploaded_file) or []
+        return bulk_import_tasted(User.objects.get(pk=user_pk), checkins)
+    finally:
+        default_storage.delete(storage_key)
+
+
 def sync_rss_feeds(user: str | None = None) -> str:
     kwargs = {}
     if user:
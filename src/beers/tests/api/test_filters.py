@@ -1,9 +1,10 @@
 import pytest
 from beers.api.filters import BeerFilter, NullsAlwaysLastOrderingFilter
-from beers.models import Beer
+from beers.models import Beer, Release
 from beers.tests.factories import (
     BeerFactory,
     BreweryFactory,
+    CountryFactory,
     StockFactory,
     StoreFactory,
 )
@@ -43,6 +44,18 @@ class TestStoreFilter:
         assert beer1.pk in pks
         assert beer2.pk in pks
 
+    def test_beer_in_multiple_stores_is_returned_once(self) -> None:
+        store1 = StoreFactory(store_id=300)
+        store2 = StoreFactory(store_id=301)
+        beer = BeerFactory()
+        StockFactory(store=store1, beer=beer, quantity=2)
+        StockFactory(store=store2, beer=beer, quantity=4)
+
+        f = BeerFilter()
+        result = f.custom_store_filter(Beer.objects.all(), "store", "300,301")
+
+        assert list(result.values_list("pk", flat=True)) == [beer.pk]
+
     def test_non_digit_store_id_returns_all(self) -> None:
         BeerFactory()
 
@@ -52,6 +65,61 @@ class TestStoreFilter:
         assert result.count() == Beer.objects.count()
 
 
+@pytest.mark.django_db
+class TestCaseInsensitiveInFilters:
+    def test_product_selection_matches_any_case(self) -> None:
+        beer_a = BeerFactory(product_selection="Basisutvalget")
+        beer_b = BeerFactory(product_selection="Bestillingsutvalget")
+        beer_c = BeerFactory(product_selection="Tilleggsutvalget")
+
+        f = BeerFilter()
+        result = f.custom_product_selection_filter(
+            Beer.objects.all(),
+            "product_selection",
+            "basisutvalget, BESTILLINGSUTVALGET",
+        )
+        pks = set(result.values_list("pk", flat=True))
+
+        assert pks == {beer_a.pk, beer_b.pk}
+        assert beer_c.pk not in pks
+
+    def test_country_matches_any_case(self) -> None:
+        beer_in = BeerFactory(country=CountryFactory(name="Norge"))
+        beer_out = BeerFactory(country=CountryFactory(name="Sverige"))
+
+        f = BeerFilter()
+        result = f.custom_country_filter(Beer.objects.all(), "country", "norge")
+        pks = list(result.values_list("pk", flat=True))
+
+        assert beer_in.pk in pks
+        assert beer_out.pk not in pks
+
+
+@pytest.mark.django_db
+class TestReleaseFilter:
+    def test_filters_by_release_name_case_insensitive(self) -> None:
+        beer_in = BeerFactory()
+        beer_out = BeerFactory()
+        Release.objects.create(name="Spring").beer.add(beer_in)
+
+        f = BeerFilter()
+        result = f.custom_release_filter(Beer.objects.all(), "release", "spring")
+        pks = list(result.values_list("pk", flat=True))
+
+        assert beer_in.pk in pks
+        assert beer_out.pk not in pks
+
+    def test_beer_in_multiple_releases_is_returned_once(self) -> None:
+        beer = BeerFactory()
+        Release.objects.create(name="Spring").beer.add(beer)
+        Release.objects.create(name="Autumn").beer.add(beer)
+
+        f = BeerFilter()
+        result = f.custom_release_filter(Beer.objects.all(), "release", "Spring,Autumn")
+
+        assert list(result.values_list("pk", flat=True)) == [beer.pk]
+
+
 @pytest.mark.django_db
 class TestAllergenFilter:
     def test_exclude_single_allergen(self) -> None:
@@ -28,6 +28,21 @@ class TestMarkTasted:
         response = client.post(f"/beers/{beer.pk}/mark_tasted/")
         assert response.status_code == 200
 
+    def test_mark_tasted_unknown_beer(self, auth_client: tuple) -> None:
+        client, user = auth_client
+        response = client.post("/beers/424242/mark_tasted/")
+        assert response.status_code == 404
+        assert not Tasted.objects.filter(user=user).exists()
+
+    def test_mark_tasted_single_insert(
+        self, auth_client: tuple, django_assert_num_queries
+    ) -> None:
+        client, _user = auth_client
+        beer = BeerFactory()
+        with django_assert_num_queries(1):
+            response = client.post(f"/beers/{beer.pk}/mark_tasted/")
+        assert response.status_code == 201
+
     def test_unmark_tasted_deletes_record(self, auth_client: tuple) -> None:
         client, user = auth_client
         beer = BeerFactory()
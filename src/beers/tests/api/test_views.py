@@ -1,12 +1,19 @@
 import io
+import json
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
+from beers.api.serializers import SharedUserListSerializer
+from beers.api.utils import invalidate_beer_representations
+from beers.api.views import BeerViewSet, StockChangeViewSet
 from beers.models import (
     Badge,
+    Beer,
     Release,
     Stock,
     Tasted,
+    UntappdCheckin,
     UntappdRssFeed,
     UserList,
     UserListItem,
@@ -14,6 +21,7 @@ from beers.models import (
 )
 from beers.tests.factories import (
     BeerFactory,
+    BreweryFactory,
     CountryFactory,
     StockFactory,
     StoreFactory,
@@ -23,6 +31,8 @@ from beers.vmp import VmpApiError, VmpBlockedError
 from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.authtoken.models import Token
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 
@@ -56,6 +66,162 @@ class TestBeerViewSet:
         response = client.get(f"/beers/{beer.pk}/")
         assert response.data["badges"][0]["text"] == "New"
 
+    def test_store_stock_for_list_page(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, _user = auth_client
+        store = StoreFactory(store_id=600)
+        other = StoreFactory(store_id=601)
+        for quantity in (1, 2, 3):
+            beer = BeerFactory()
+            StockFactory(store=store, beer=beer, quantity=quantity)
+            StockFactory(store=other, beer=beer, quantity=quantity + 10)
+        with django_assert_max_num_queries(2):
+            response = client.get("/beers/?check_store=600&fields=vmp_id,stock")
+        assert sorted(b["stock"] for b in response.data["results"]) == [1, 2, 3]
+
+    def test_list_reuses_cached_beer_representation(self, auth_client: tuple) -> None:
+        client, _user = auth_client
+        beer = BeerFactory(price=100.0, vmp_updated=timezone.now())
+        client.get("/beers/")
+
+        Beer.objects.filter(pk=beer.pk).update(price=120.0)
+        Badge.objects.create(beer=beer, text="New", type="info")
+        cached = client.get("/beers/").data["results"][0]
+        assert cached["price"] == 100.0
+        assert cached["badges"] == [{"text": "New"}]
+
+        Beer.objects.filter(pk=beer.pk).update(vmp_updated=timezone.now())
+        refreshed = client.get("/beers/").data["results"][0]
+        assert refreshed["price"] == 120.0
+
+    def test_details_fetch_refreshes_cached_representation(
+        self, auth_client: tuple
+    ) -> None:
+        client, _user = auth_client
+        beer = BeerFactory(storable=None)
+        client.get("/beers/")
+
+        Beer.objects.filter(pk=beer.pk).update(
+            storable="5 år", vmp_details_fetched=timezone.now()
+        )
+        assert client.get("/beers/").data["results"][0]["storable"] == "5 år"
+
+    def test_patch_refreshes_cached_representation(self) -> None:
+        client = APIClient()
+        client.force_authenticate(user=UserFactory(is_staff=True, is_superuser=True))
+        beer = BeerFactory(description="Old")
+        client.get("/beers/")
+
+        response = client.patch(
+            f"/beers/{beer.pk}/", {"description": "New"}, format="json"
+        )
+        assert response.status_code == 200
+        assert client.get("/beers/").data["results"][0]["description"] == "New"
+
+    def test_invalidation_refreshes_cached_representation(
+        self, auth_client: tuple
+    ) -> None:
+        client, _user = auth_client
+        beer = BeerFactory(description="Old")
+        client.get("/beers/")
+
+        Beer.objects.filter(pk=beer.pk).update(description="New")
+        invalidate_beer_representations()
+        assert client.get("/beers/").data["results"][0]["description"] == "New"
+
+    def test_badges_do_not_query_per_beer(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, _user = auth_client
+        for _ in range(5):
+            Badge.objects.create(beer=BeerFactory(), text="New", type="info")
+        with django_assert_max_num_queries(4):
+            response = client.get("/beers/?fields=vmp_id,badges")
+        assert all(
+            beer["badges"] == [{"text": "New"}] for beer in response.data["results"]
+        )
+
+    def test_all_stock_lists_stocked_stores(self, auth_client: tuple) -> None:
+        client, _user = auth_client
+        beer = BeerFactory()
+        store = StoreFactory(store_id=700, name="Oslo", gps_lat=59.9, gps_long=10.7)
+        StockFactory(store=store, beer=beer, quantity=4)
+        StockFactory(store=StoreFactory(store_id=701), beer=beer, quantity=0)
+        response = client.get(f"/beers/{beer.pk}/?all_stock=true")
+        assert response.data["all_stock"] == [
+            {"store_name": "Oslo", "quantity": 4, "gps_lat": 59.9, "gps_long": 10.7}
+        ]
+
+    def test_all_stock_prefetched_for_list_page(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, _user = auth_client
+        store = StoreFactory(store_id=710)
+        for quantity in (1, 2, 3):
+            StockFactory(store=store, beer=BeerFactory(), quantity=quantity)
+        with django_assert_max_num_queries(4):
+            response = client.get("/beers/?all_stock=true&fields=vmp_id,all_stock")
+        assert sorted(
+            b["all_stock"][0]["quantity"] for b in response.data["results"]
+        ) == [1, 2, 3]
+
+    def test_fields_param_limits_selected_columns(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, _user = auth_client
+        BeerFactory(
+            country=CountryFactory(name="Norway", iso_code="NO"),
+            brewery=BreweryFactory(name="Lervig"),
+            description="Long text",
+        )
+        with django_assert_max_num_queries(4) as queries:
+            response = client.get(
+                "/beers/?fields=vmp_id,country_code,brewery,brewery_details"
+            )
+        beer = response.data["results"][0]
+        assert beer["country_code"] == "NO"
+        assert beer["brewery"] == "Lervig"
+        assert beer["brewery_details"]["name"] == "Lervig"
+        select = next(q["sql"] for q in queries if "beers_country" in q["sql"])
+        assert '"beers_beer"."description"' not in select
+
+    def test_omit_param_defers_omitted_columns(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, _user = auth_client
+        BeerFactory(description="Long text", food_pairing="Cheese", price=99.0)
+        with django_assert_max_num_queries(4) as queries:
+            response = client.get("/beers/?omit=description,food_pairing")
+        beer = response.data["results"][0]
+        assert "description" not in beer
+        assert beer["price"] == 99.0
+        select = next(q["sql"] for q in queries if '"beers_beer"."price"' in q["sql"])
+        assert '"beers_beer"."description"' not in select
+        assert '"beers_beer"."food_pairing"' not in select
+
+    def test_default_list_skips_unserialized_columns(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, _user = auth_client
+        BeerFactory(price=99.0)
+        with django_assert_max_num_queries(4) as queries:
+            response = client.get("/beers/")
+        assert response.data["results"][0]["price"] == 99.0
+        select = next(q["sql"] for q in queries if '"beers_beer"."price"' in q["sql"])
+        assert '"beers_beer"."match_manually"' not in select
+        assert '"beers_beer"."active"' not in select
+
+    def test_user_tasted_prefetch(self, auth_client: tuple) -> None:
+        client, user = auth_client
+        tasted = BeerFactory()
+        BeerFactory()
+        Tasted.objects.create(user=user, beer=tasted)
+        response = client.get("/beers/?fields=vmp_id,user_tasted")
+        flags = {b["vmp_id"]: b["user_tasted"] for b in response.data["results"]}
+        assert sum(flags.values()) == 1
+        assert flags[tasted.vmp_id] is True
+
     def test_beers_param_filters(self, auth_client: tuple) -> None:
         client, _user = auth_client
         b1 = BeerFactory()
@@ -65,6 +231,12 @@ class TestBeerViewSet:
         ids = {r["vmp_id"] for r in response.data["results"]}
         assert ids == {b1.vmp_id, b2.vmp_id}
 
+    def test_beers_param_rejects_bad_ids(self, auth_client: tuple) -> None:
+        client, _user = auth_client
+        assert client.get("/beers/?beers=1,abc").status_code == 400
+        with patch("beers.api.views.MAX_BEER_IDS", 2):
+            assert client.get("/beers/?beers=1,2,3").status_code == 400
+
     def test_styles_action(self, auth_client: tuple) -> None:
         client, _user = auth_client
         BeerFactory(active=True, style="IPA")
@@ -73,6 +245,51 @@ class TestBeerViewSet:
         response = client.get("/beers/styles/")
         assert set(response.data) == {"IPA", "Stout"}
 
+    def test_styles_are_cached(
+        self, auth_client: tuple, django_assert_num_queries
+    ) -> None:
+        client, _user = auth_client
+        BeerFactory(style="IPA")
+        client.get("/beers/styles/")
+        BeerFactory(style="Porter")
+        with django_assert_num_queries(0):
+            response = client.get("/beers/styles/")
+        assert response.data == ["IPA"]
+
+    def test_stream_returns_every_beer(self, auth_client: tuple) -> None:
+        client, _user = auth_client
+        beers = [BeerFactory() for _ in range(3)]
+        with patch("beers.api.views.STREAM_CHUNK_SIZE", 2):
+            response = client.get("/beers/?stream=1&fields=vmp_id")
+        assert response.streaming
+        rows = json.loads(b"".join(response.streaming_content))
+        assert sorted(r["vmp_id"] for r in rows) == sorted(b.pk for b in beers)
+
+    def test_browsable_renderer_only_for_html_clients(self, auth_client: tuple) -> None:
+        client, _user = auth_client
+        BeerFactory()
+        json_response = client.get("/beers/", HTTP_ACCEPT="application/json")
+        html_response = client.get("/beers/", HTTP_ACCEPT="text/html")
+        assert json_response["Content-Type"] == "application/json"
+        assert html_response["Content-Type"].startswith("text/html")
+
+    def test_json_renderers_are_shared_between_requests(self) -> None:
+        first = BeerViewSet(request=None).get_renderers()
+        second = StockChangeViewSet(request=None).get_renderers()
+        assert first is second
+        assert not any(isinstance(r, BrowsableAPIRenderer) for r in first)
+
+    def test_url_reversed_once_per_list(self, auth_client: tuple) -> None:
+        client, _user = auth_client
+        beers = [BeerFactory(), BeerFactory()]
+        with patch("rest_framework.relations.reverse", wraps=reverse) as reversed_url:
+            response = client.get("/beers/?fields=vmp_id,url")
+        assert reversed_url.call_count == 1
+        urls = {b["vmp_id"]: b["url"] for b in response.data["results"]}
+        assert urls == {
+            beer.pk: f"http://testserver/beers/{beer.pk}/" for beer in beers
+        }
+
 
 @pytest.mark.django_db
 class TestBulkMarkTasted:
@@ -112,6 +329,44 @@ class TestBulkMarkTasted:
         assert response.status_code == 200
         assert Tasted.objects.filter(user=user, beer=beer).exists()
 
+    def test_large_import_is_stored_and_queued(
+        self, auth_client: tuple, settings, tmp_path
+    ) -> None:
+        settings.MEDIA_ROOT = str(tmp_path)
+        client, user = auth_client
+        rows = "".join(f"{i},{i},4.0,2024-01-01 12:00:00\n" for i in range(1, 4))
+        f = io.BytesIO(f"checkin_id,bid,rating_score,created_at\n{rows}".encode())
+        f.name = "checkins.csv"
+        with (
+            patch("beers.api.views.BULK_TASTED_SYNC_BYTES", 10),
+            patch("beers.api.views.async_task", return_value="job-1") as enqueue,
+        ):
+            response = client.post("/beers/bulk_mark_tasted/", {"file": f})
+        assert response.status_code == 202
+        assert response.data["job_id"] == "job-1"
+        task, user_pk, storage_key = enqueue.call_args.args
+        assert (task, user_pk) == ("beers.tasks.bulk_import_tasted_task", user.pk)
+        assert storage_key.startswith(f"tasted_imports/{user.pk}/")
+        assert storage_key.endswith(".csv")
+        assert (tmp_path / storage_key).read_bytes() == f.getvalue()
+        assert not UntappdCheckin.objects.exists()
+
+    def test_large_import_with_bad_header_is_rejected(
+        self, auth_client: tuple, settings, tmp_path
+    ) -> None:
+        settings.MEDIA_ROOT = str(tmp_path)
+        client, _user = auth_client
+        f = io.BytesIO(b"name,score\nfoo,1\n")
+        f.name = "checkins.csv"
+        with (
+            patch("beers.api.views.BULK_TASTED_SYNC_BYTES", 10),
+            patch("beers.api.views.async_task") as enqueue,
+        ):
+            response = client.post("/beers/bulk_mark_tasted/", {"file": f})
+        assert response.status_code == 400
+        assert not enqueue.called
+        assert not any(tmp_path.rglob("*.csv"))
+
 
 @pytest.mark.django_db
 class TestStockChangeViewSet:
@@ -133,6 +388,71 @@ class TestStockChangeViewSet:
         matched = [r for r in results if r["beer"]["vmp_id"] == beer.vmp_id]
         assert matched[0]["beer"]["user_tasted"] is expected
 
+    def test_tasted_looked_up_once_per_page(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, user = auth_client
+        beers = [BeerFactory() for _ in range(3)]
+        for beer in beers:
+            StockFactory(beer=beer, quantity=1)
+        Stock.objects.update(stocked_at=timezone.now())
+        Tasted.objects.create(user=user, beer=beers[0])
+        with django_assert_max_num_queries(5) as queries:
+            results = client.get("/stockchange/").data["results"]
+        tasted_queries = [q for q in queries if "beers_tasted" in q["sql"]]
+        assert len(tasted_queries) == 1
+        assert "EXISTS" not in tasted_queries[0]["sql"]
+        assert {r["beer"]["vmp_id"]: r["beer"]["user_tasted"] for r in results} == {
+            beers[0].vmp_id: True,
+            beers[1].vmp_id: False,
+            beers[2].vmp_id: False,
+        }
+
+    def test_beer_stock_for_selected_store(self, auth_client: tuple) -> None:
+        client, _user = auth_client
+        beer = BeerFactory()
+        store = StoreFactory(store_id=610)
+        StockFactory(store=store, beer=beer, quantity=4)
+        StockFactory(store=StoreFactory(store_id=611), beer=beer, quantity=9)
+        Stock.objects.filter(beer=beer).update(stocked_at=timezone.now())
+        response = client.get("/stockchange/?store=610")
+        results = response.data.get("results", response.data)
+        assert [r["beer"]["stock"] for r in results] == [4]
+
+    def test_stream_matches_paginated_rows(self, auth_client: tuple) -> None:
+        client, _user = auth_client
+        for _ in range(3):
+            StockFactory(beer=BeerFactory(), quantity=2)
+        Stock.objects.update(stocked_at=timezone.now())
+        paginated = client.get("/stockchange/").json()["results"]
+        with patch("beers.api.views.STREAM_CHUNK_SIZE", 2):
+            response = client.get("/stockchange/?stream=true")
+        assert response.streaming
+        assert json.loads(b"".join(response.streaming_content)) == paginated
+
+    def test_list_rows_match_serializer(self, auth_client: tuple) -> None:
+        client, user = auth_client
+        beer = BeerFactory(country=CountryFactory(name="Norway", iso_code="NO"))
+        store = StoreFactory(store_id=620)
+        stock = StockFactory(store=store, beer=beer, quantity=3)
+        Stock.objects.filter(pk=stock.pk).update(stocked_at=timezone.now())
+        Tasted.objects.create(user=user, beer=beer)
+        listed = client.get("/stockchange/?store=620").data["results"][0]
+        detail = client.get(f"/stockchange/{stock.pk}/?store=620").data
+        assert listed == detail
+        assert listed["beer"]["country_code"] == "NO"
+
+    def test_detail_loads_country_with_beer(self, django_assert_num_queries) -> None:
+        beer = BeerFactory(country=CountryFactory(name="Sweden", iso_code="SE"))
+        stock = StockFactory(beer=beer, quantity=2)
+        Stock.objects.filter(pk=stock.pk).update(stocked_at=timezone.now())
+        with django_assert_num_queries(2) as queries:
+            response = APIClient().get(f"/stockchange/{stock.pk}/")
+        assert response.data["beer"]["country"] == "Sweden"
+        assert response.data["beer"]["country_code"] == "SE"
+        assert response.data["store"] == stock.store_id
+        assert not any("beers_store" in q["sql"] for q in queries)
+
 
 @pytest.mark.django_db
 class TestCountryViewSet:
@@ -149,6 +469,65 @@ class TestCountryViewSet:
         assert "Sweden" in names
         assert "Finland" not in names
 
+    def test_active_countries_are_cached(
+        self, auth_client: tuple, django_assert_num_queries
+    ) -> None:
+        client, _user = auth_client
+        BeerFactory(country=CountryFactory(name="Norway"), active=True)
+        client.get("/countries/active/")
+        BeerFactory(country=CountryFactory(name="Sweden"), active=True)
+        with django_assert_num_queries(0):
+            response = client.get("/countries/active/")
+        assert [c["name"] for c in response.data] == ["Norway"]
+
+
+@pytest.mark.django_db
+class TestBeerListCache:
+    def test_anonymous_list_is_cached(self) -> None:
+        client = APIClient()
+        BeerFactory()
+
+        first_response = client.get("/beers/")
+        assert first_response.data["count"] == 1
+
+        BeerFactory()
+
+        cached_response = client.get("/beers/")
+        assert cached_response.data["count"] == 1
+
+        cache.clear()
+        fresh_response = client.get("/beers/")
+        assert fresh_response.data["count"] == 2
+
+    def test_anonymous_pages_share_cached_count(
+        self, django_assert_num_queries
+    ) -> None:
+        client = APIClient()
+        for _ in range(3):
+            BeerFactory()
+        client.get("/beers/?page_size=2")
+
+        with django_assert_num_queries(2) as queries:
+            response = client.get("/beers/?page_size=2&page=2")
+
+        assert response.data["count"] == 3
+        assert not any("COUNT(" in q["sql"] for q in queries)
+
+    def test_authenticated_list_is_private(self) -> None:
+        user = UserFactory()
+        token = Token.objects.create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        BeerFactory()
+
+        first_response = client.get("/beers/")
+        assert "private" in first_response["Cache-Control"]
+
+        BeerFactory()
+
+        second_response = client.get("/beers/")
+        assert second_response.data["count"] == 2
+
 
 @pytest.mark.django_db
 class TestReleaseViewSet:
@@ -169,6 +548,76 @@ class TestReleaseViewSet:
         fresh_response = client.get("/release/")
         assert fresh_response.data["results"][0]["beer_count"] == 2
 
+    def test_product_stats_in_single_query(self, django_assert_num_queries) -> None:
+        release = Release.objects.create(name="Stats")
+        release.beer.add(
+            BeerFactory(main_category="Øl"),
+            BeerFactory(main_category="Øl"),
+            BeerFactory(main_category="Sider"),
+            BeerFactory(main_category="Mjød"),
+        )
+
+        with django_assert_num_queries(1):
+            response = APIClient().get(f"/release/{release.pk}/")
+
+        assert response.data["product_stats"] == {
+            "product_count": 4,
+            "beer_count": 2,
+            "cider_count": 1,
+            "mead_count": 1,
+        }
+
+    def test_unrequested_aggregates_are_skipped(
+        self, django_assert_num_queries
+    ) -> None:
+        release = Release.objects.create(name="Lean")
+        release.beer.add(BeerFactory(product_selection="Basisutvalget"))
+
+        with django_assert_num_queries(2) as queries:
+            response = APIClient().get("/release/?fields=name,product_selections")
+
+        assert response.data["results"] == [
+            {"name": "Lean", "product_selections": ["Basisutvalget"]}
+        ]
+        page_sql = queries[-1]["sql"]
+        assert "ARRAY_AGG" in page_sql
+        assert "COUNT" not in page_sql
+
+    def test_name_only_skips_grouping(self, django_assert_num_queries) -> None:
+        Release.objects.create(name="Plain")
+        with django_assert_num_queries(2) as queries:
+            APIClient().get("/release/?fields=name")
+        assert "GROUP BY" not in queries[-1]["sql"]
+
+    def test_release_countries(self) -> None:
+        norway = CountryFactory(name="Norge")
+        denmark = CountryFactory(name="Danmark")
+        release = Release.objects.create(name="Countries")
+        release.beer.add(
+            BeerFactory(country=norway),
+            BeerFactory(country=norway),
+            BeerFactory(country=denmark),
+        )
+        BeerFactory(country=CountryFactory(name="Sverige"))
+
+        response = APIClient().get(f"/release/{release.pk}/countries/")
+
+        assert [c["name"] for c in response.data] == ["Danmark", "Norge"]
+
+    def test_release_styles_are_cached(self, django_assert_num_queries) -> None:
+        client = APIClient()
+        release = Release.objects.create(name="Styles")
+        release.beer.add(BeerFactory(style="IPA"), BeerFactory(style="Stout"))
+        assert client.get(f"/release/{release.pk}/styles/").data == ["IPA", "Stout"]
+
+        release.beer.add(BeerFactory(style="Porter"))
+        with django_assert_num_queries(0):
+            response = client.get(f"/release/{release.pk}/styles/?page=1")
+        assert response.data == ["IPA", "Stout"]
+
+    def test_release_styles_unknown_release(self) -> None:
+        assert APIClient().get("/release/999/styles/").status_code == 404
+
 
 @pytest.mark.django_db
 class TestUserListViewSet:
@@ -202,6 +651,26 @@ class TestUserListViewSet:
         )
         assert response.status_code == 409
 
+    def test_add_item_appends_in_one_lookup(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, user = auth_client
+        user_list = UserList.objects.create(user=user, name="Test", sort_order=1)
+        UserListItem.objects.create(list=user_list, product_id="1", sort_order=4)
+        beer = BeerFactory()
+        with django_assert_max_num_queries(5):
+            response = client.post(
+                f"/lists/{user_list.pk}/items/", {"product_id": str(beer.vmp_id)}
+            )
+        assert response.status_code == 201
+        assert response.data["sort_order"] == 5
+
+    def test_add_unknown_product_returns_404(self, auth_client: tuple) -> None:
+        client, user = auth_client
+        user_list = UserList.objects.create(user=user, name="Test", sort_order=1)
+        response = client.post(f"/lists/{user_list.pk}/items/", {"product_id": "999"})
+        assert response.status_code == 404
+
     def test_add_item_to_untappd_list_blocked(self, auth_client: tuple) -> None:
         client, user = auth_client
         from beers.models import UntappdList
@@ -218,6 +687,41 @@ class TestUserListViewSet:
         )
         assert response.status_code == 403
 
+    def test_sync_status_loaded_for_all_lists(
+        self, auth_client: tuple, django_assert_num_queries
+    ) -> None:
+        client, user = auth_client
+        from beers.models import UntappdList
+        from django_q.models import OrmQ, Task
+
+        now = timezone.now()
+        Task.objects.create(
+            id="done", name="done", func="f", started=now, stopped=now, success=True
+        )
+        Task.objects.create(
+            id="broke", name="broke", func="f", started=now, stopped=now, success=False
+        )
+        OrmQ.objects.create(key="waiting", payload="")
+        for i, task_id in enumerate(("done", "broke", "waiting", "busy", "")):
+            untappd_list = UntappdList.objects.create(
+                untappd_list_id=i,
+                untappd_username="test",
+                name=f"List {i}",
+                sync_task_id=task_id,
+            )
+            UserList.objects.create(
+                user=user, name=f"List {i}", sort_order=i, untappd_list=untappd_list
+            )
+        with django_assert_num_queries(5):
+            response = client.get("/lists/")
+        assert [item["sync_status"] for item in response.data] == [
+            "success",
+            "failed",
+            "queued",
+            "running",
+            None,
+        ]
+
     def test_item_detail_patch(self, auth_client: tuple) -> None:
         client, user = auth_client
         user_list = UserList.objects.create(user=user, name="Test", sort_order=1)
@@ -278,6 +782,24 @@ class TestUserListViewSet:
         assert l2.sort_order == 0
         assert l1.sort_order == 1
 
+    def test_reorder_lists_issues_one_update(
+        self, auth_client: tuple, django_assert_max_num_queries
+    ) -> None:
+        client, user = auth_client
+        lists = [
+            UserList.objects.create(user=user, name=str(i), sort_order=i)
+            for i in range(5)
+        ]
+        list_ids = [user_list.pk for user_list in reversed(lists)]
+        with django_assert_max_num_queries(5) as queries:
+            client.post("/lists/reorder/", {"list_ids": list_ids}, format="json")
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(updates) == 1
+        assert (
+            list(UserList.objects.filter(user=user).values_list("pk", flat=True))
+            == list_ids
+        )
+
     def test_reorder_items(self, auth_client: tuple) -> None:
         client, user = auth_client
         user_list = UserList.objects.create(user=user, name="Test", sort_order=1)
@@ -431,6 +953,73 @@ class TestUserListViewSet:
         response_yes = client.get(f"/lists/{with_store.pk}/")
         assert "total_price" in response_yes.data
 
+    def test_stats_and_total_price_values(self, auth_client: tuple) -> None:
+        client, user = auth_client
+        user_list = UserList.objects.create(
+            user=user, name="Cellar", show_vintage=True, show_store=True
+        )
+        stout = BeerFactory(price=100.0)
+        porter = BeerFactory(price=None)
+        UserListItem.objects.create(
+            list=user_list, product_id=str(stout.pk), quantity=2, year=2019
+        )
+        UserListItem.objects.create(
+            list=user_list, product_id=str(porter.pk), quantity=3, year=2022
+        )
+        response = client.get(f"/lists/{user_list.pk}/")
+        assert response.data["stats"] == {
+            "total_bottles": 5,
+            "total_value": 200.0,
+            "oldest_year": 2019,
+            "newest_year": 2022,
+        }
+        assert response.data["total_price"] == 200.0
+        assert response.data["item_count"] == 5
+
+    def test_list_prices_loaded_once_for_all_lists(
+        self, auth_client: tuple, django_assert_num_queries
+    ) -> None:
+        client, user = auth_client
+        for i, price in enumerate((10.0, 20.0, 30.0)):
+            user_list = UserList.objects.create(
+                user=user, name=f"List {i}", sort_order=i, show_store=True
+            )
+            UserListItem.objects.create(
+                list=user_list, product_id=str(BeerFactory(price=price).pk)
+            )
+        with django_assert_num_queries(4):
+            response = client.get("/lists/")
+        assert [item["total_price"] for item in response.data] == [10.0, 20.0, 30.0]
+
+    def test_is_past_uses_one_date_per_request(self, auth_client: tuple) -> None:
+        client, user = auth_client
+        today = timezone.localdate()
+        for i, days in enumerate((-1, 1)):
+            UserList.objects.create(
+                user=user,
+                name=f"Event {i}",
+                sort_order=i,
+                event_date=today + timedelta(days=days),
+            )
+        with patch("beers.api.serializers.date") as mock_date:
+            mock_date.today.return_value = today
+            response = client.get("/lists/")
+        assert [item["is_past"] for item in response.data] == [True, False]
+        assert mock_date.today.call_count == 1
+
+    def test_list_includes_followed_lists(self, auth_client: tuple) -> None:
+        client, user = auth_client
+        owner = UserFactory()
+        first = UserList.objects.create(user=owner, name="First")
+        second = UserList.objects.create(user=owner, name="Second")
+        for followed in (second, first):
+            client.post(f"/lists/shared/{followed.share_token}/follow/")
+        response = client.get("/lists/")
+        followed_names = {
+            item["name"] for item in response.data if item.get("is_followed")
+        }
+        assert followed_names == {"First", "Second"}
+
     def test_shared_list_includes_flags(self) -> None:
         user = UserFactory()
         user_list = UserList.objects.create(
@@ -514,6 +1103,31 @@ class TestSharedUserListSerializer:
         response = client.get(f"/lists/shared/{user_list.share_token}/")
         assert response.data["user_name"] == "Test User"
 
+    def test_user_name_falls_back_to_username(self, django_assert_num_queries) -> None:
+        user = UserFactory(username="cellar-keeper")
+        user_list = UserList.objects.create(user=user, name="Shared", sort_order=1)
+        client = APIClient()
+        with django_assert_num_queries(3):
+            response = client.get(f"/lists/shared/{user_list.share_token}/")
+        assert response.data["user_name"] == "cellar-keeper"
+
+    def test_shared_list_is_cached_until_items_change(
+        self, django_assert_num_queries
+    ) -> None:
+        user = UserFactory()
+        user_list = UserList.objects.create(user=user, name="Shared", sort_order=1)
+        owner = APIClient()
+        owner.force_authenticate(user=user)
+        client = APIClient()
+        url = f"/lists/shared/{user_list.share_token}/"
+        client.get(url)
+        with django_assert_num_queries(1):
+            assert client.get(url).data["item_count"] == 0
+
+        beer = BeerFactory()
+        owner.post(f"/lists/{user_list.pk}/items/", {"product_id": str(beer.pk)})
+        assert client.get(url).data["item_count"] == 1
+
     def test_includes_store_name(self) -> None:
         user = UserFactory()
         store = StoreFactory(store_id=999, name="My Store")
@@ -524,6 +1138,17 @@ class TestSharedUserListSerializer:
         response = client.get(f"/lists/shared/{user_list.share_token}/")
         assert response.data["store_name"] == "My Store"
 
+    def test_store_name_from_context_map(self, django_assert_num_queries) -> None:
+        user = UserFactory()
+        user_list = UserList.objects.create(
+            user=user, name="Shared", sort_order=1, selected_store_id=999
+        )
+        serializer = SharedUserListSerializer(
+            user_list, context={"store_names": {999: "Preloaded"}}
+        )
+        with django_assert_num_queries(0):
+            assert serializer.get_store_name(user_list) == "Preloaded"
+
 
 @pytest.mark.django_db
 class TestBarcodeLookup:
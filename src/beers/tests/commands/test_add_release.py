@@ -0,0 +1,65 @@
+from io import StringIO
+
+import pytest
+from beers.models import VmpNotReleased
+from django.core.management import call_command
+from django_q.models import Schedule
+
+
+@pytest.mark.django_db
+class TestAddRelease:
+    def _call(self, products: str) -> str:
+        out = StringIO()
+        call_command(
+            "add_release",
+            name="Juleøl",
+            products=products,
+            badge_text="Jul",
+            badge_type="release",
+            days=7,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_creates_products_in_one_insert(
+        self, django_assert_max_num_queries
+    ) -> None:
+        with django_assert_max_num_queries(10) as queries:
+            self._call("101, 102,103")
+        inserts = [
+            q for q in queries if "INSERT" in q["sql"] and "vmpnotreleased" in q["sql"]
+        ]
+        assert len(inserts) == 1
+        assert set(VmpNotReleased.objects.values_list("id", flat=True)) == {
+            101,
+            102,
+            103,
+        }
+        assert (
+            Schedule.objects.get(func="beers.tasks.update_beers_from_untappd").kwargs
+            == "calls=3"
+        )
+
+    def test_schedules_in_one_insert(self, django_assert_max_num_queries) -> None:
+        with django_assert_max_num_queries(10) as queries:
+            self._call("101")
+        inserts = [
+            q
+            for q in queries
+            if "INSERT" in q["sql"] and "django_q_schedule" in q["sql"]
+        ]
+        assert len(inserts) == 1
+        assert set(Schedule.objects.values_list("func", flat=True)) == {
+            "beers.tasks.get_unreleased_beers_from_vmp",
+            "beers.tasks.create_release",
+            "beers.tasks.create_badges_custom",
+            "beers.tasks.remove_badges",
+            "beers.tasks.update_beers_from_untappd",
+        }
+
+    def test_existing_products_are_skipped(self) -> None:
+        VmpNotReleased.objects.create(id=101)
+        output = self._call("101,102")
+        assert "Created 1 of 2 unreleased products" in output
+        assert VmpNotReleased.objects.count() == 2
+        assert Schedule.objects.count() == 5
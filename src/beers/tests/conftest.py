@@ -1,5 +1,6 @@
 import pytest
 import requests
+from beers.api.utils import clear_country_cache
 from curl_cffi import requests as cffi
 from django.core.cache import cache
 
@@ -7,6 +8,7 @@ from django.core.cache import cache
 @pytest.fixture(autouse=True)
 def clear_cache() -> None:
     cache.clear()
+    clear_country_cache()
 
 
 @pytest.fixture(autouse=True)
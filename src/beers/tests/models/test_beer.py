@@ -1,5 +1,6 @@
 import pytest
 import responses
+from beers.api.utils import beer_representation_version
 from beers.models import Option, WrongMatch
 from beers.tests.factories import BeerFactory, BreweryFactory
 
@@ -130,6 +131,7 @@ class TestWrongMatchSave:
         assert beer.untpd_id == 99999
         assert beer.untpd_url == "https://untappd.com/beer/99999"
         assert beer.verified_match is True
+        assert beer_representation_version() == 1
         with pytest.raises(WrongMatch.DoesNotExist):
             WrongMatch.objects.get(pk=wm.pk)
 
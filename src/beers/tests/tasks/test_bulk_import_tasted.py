@@ -0,0 +1,36 @@
+import pytest
+from beers.models import Tasted
+from beers.tasks import bulk_import_tasted_task
+from beers.tests.factories import BeerFactory, UserFactory
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+
+@pytest.mark.django_db
+def test_bulk_import_tasted_task(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    user = UserFactory()
+    beer = BeerFactory(untpd_id=700)
+    storage_key = default_storage.save(
+        "tasted_imports/checkins.csv",
+        ContentFile(b"checkin_id,bid,rating_score,created_at\n5001,700,4.0,\n"),
+    )
+
+    result = bulk_import_tasted_task(user.pk, storage_key)
+
+    assert result == {"imported_count": 1, "total_check_ins": 1}
+    assert Tasted.objects.filter(user=user, beer=beer).exists()
+    assert not default_storage.exists(storage_key)
+
+
+@pytest.mark.django_db
+def test_bulk_import_tasted_task_deletes_file_on_failure(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    storage_key = default_storage.save(
+        "tasted_imports/checkins.json", ContentFile(b"not json")
+    )
+
+    with pytest.raises(ValueError):
+        bulk_import_tasted_task(UserFactory().pk, storage_key)
+
+    assert not default_storage.exists(storage_key)
@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 import pytest
+from beers.api.utils import beer_representation_version
 from beers.models import Beer
 from beers.tasks import deactivate_inactive
 from django.utils import timezone
@@ -22,6 +23,7 @@ def test_deactivate_inactive_beer() -> None:
 
     beer.refresh_from_db()
     assert not beer.active
+    assert beer_representation_version() == 1
 
 
 @pytest.mark.django_db
@@ -37,6 +39,7 @@ def test_new_beer_does_not_get_deactivated() -> None:
 
     beer = Beer.objects.get(vmp_id=12611502)
     assert beer.active
+    assert beer_representation_version() == 0
 
 
 @pytest.mark.django_db
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from beers.admin import BeerAdmin, EstimatedCountPaginator
+from beers.api.utils import beer_representation_version
+from beers.models import Beer
+from beers.tests.factories import BeerFactory
+from django.contrib.admin.sites import AdminSite
+
+
+@pytest.mark.django_db
+class TestEstimatedCountPaginator:
+    def test_small_table_uses_exact_count(self) -> None:
+        BeerFactory.create_batch(3)
+        paginator = EstimatedCountPaginator(Beer.objects.order_by("pk"), 2)
+        assert paginator.count == 3
+
+    def test_filtered_queryset_uses_exact_count(self) -> None:
+        BeerFactory.create_batch(2, active=False)
+        BeerFactory(active=True)
+        queryset = Beer.objects.filter(active=True).order_by("pk")
+        assert EstimatedCountPaginator(queryset, 2).count == 1
+
+    def test_large_unfiltered_table_uses_estimate(self) -> None:
+        with patch("beers.admin.connection.cursor") as cursor:
+            cursor.return_value.__enter__.return_value.fetchone.return_value = (250000,)
+            paginator = EstimatedCountPaginator(Beer.objects.order_by("pk"), 100)
+            assert paginator.count == 250000
+
+
+@pytest.mark.django_db
+class TestBeerAdmin:
+    def test_save_invalidates_cached_representations(self) -> None:
+        beer = BeerFactory()
+        beer.description = "Edited"
+        BeerAdmin(Beer, AdminSite()).save_model(None, beer, None, True)
+        assert beer_representation_version() == 1
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import base64
+import json
+import time
+from unittest.mock import patch
+
+import firebase_admin
+import pytest
+from config.authentication import FirebaseAuthentication, _DjangoCertificateCache
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory
+
+factory = APIRequestFactory()
+
+
+def _claims(email: str = "user@test.com") -> dict:
+    return {"uid": "uid-1", "email": email, "exp": time.time() + 3600}
+
+
+def _unsigned_jwt(uid: str, nonce: str) -> str:
+    def segment(data: dict) -> str:
+        raw = json.dumps(data).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    return f"{segment({'alg': 'RS256'})}.{segment({'sub': uid, 'n': nonce})}.c2ln"
+
+
+@pytest.mark.django_db
+class TestFirebaseAuthentication:
+    def test_no_credentials_returns_none(self) -> None:
+        request = factory.get("/beers/")
+        assert FirebaseAuthentication().authenticate(request) is None
+
+    def test_bearer_token_creates_user(self) -> None:
+        request = factory.get("/beers/", HTTP_AUTHORIZATION="Bearer token-a")
+        with patch("config.authentication.auth.verify_id_token") as verify:
+            verify.return_value = _claims()
+            user, _ = FirebaseAuthentication().authenticate(request)
+        assert user.email == "user@test.com"
+        assert User.objects.filter(email="user@test.com").exists()
+
+    def test_verified_token_is_cached(self) -> None:
+        request = factory.get("/beers/", HTTP_AUTHORIZATION="Bearer token-a")
+        with patch("config.authentication.auth.verify_id_token") as verify:
+            verify.return_value = _claims()
+            FirebaseAuthentication().authenticate(request)
+            FirebaseAuthentication().authenticate(request)
+        assert verify.call_count == 1
+
+    def test_expired_token_is_not_cached(self) -> None:
+        request = factory.get("/beers/", HTTP_AUTHORIZATION="Bearer token-a")
+        claims = {**_claims(), "exp": time.time() - 1}
+        with patch("config.authentication.auth.verify_id_token") as verify:
+            verify.return_value = claims
+            FirebaseAuthentication().authenticate(request)
+            FirebaseAuthentication().authenticate(request)
+        assert verify.call_count == 2
+
+    def test_session_cookie_is_cached(self) -> None:
+        request = factory.get("/beers/")
+        request.COOKIES["session"] = "cookie-a"
+        with patch("config.authentication.auth.verify_session_cookie") as verify:
+            verify.return_value = _claims()
+            FirebaseAuthentication().authenticate(request)
+            FirebaseAuthentication().authenticate(request)
+        assert verify.call_count == 1
+
+    def test_user_lookup_uses_cached_pk(self) -> None:
+        request = factory.get("/beers/", HTTP_AUTHORIZATION="Bearer token-a")
+        with patch("config.authentication.auth.verify_id_token") as verify:
+            verify.return_value = _claims()
+            first, _ = FirebaseAuthentication().authenticate(request)
+            with patch.object(User.objects, "get_or_create") as get_or_create:
+                second, _ = FirebaseAuthentication().authenticate(request)
+        assert get_or_create.call_count == 0
+        assert second.pk == first.pk
+
+    def test_stale_cached_pk_falls_back_to_get_or_create(self) -> None:
+        request = factory.get("/beers/", HTTP_AUTHORIZATION="Bearer token-a")
+        with patch("config.authentication.auth.verify_id_token") as verify:
+            verify.return_value = _claims()
+            first, _ = FirebaseAuthentication().authenticate(request)
+            first.delete()
+            second, _ = FirebaseAuthentication().authenticate(request)
+        assert second.email == "user@test.com"
+        assert User.objects.filter(email="user@test.com").count() == 1
+
+    def test_revocation_checked_once_per_uid_window(self) -> None:
+        with patch("config.authentication.auth.verify_id_token") as verify:
+            verify.return_value = _claims()
+            for nonce in ("a", "b"):
+                token = _unsigned_jwt("uid-1", nonce)
+                request = factory.get("/beers/", HTTP_AUTHORIZATION=f"Bearer {token}")
+                FirebaseAuthentication().authenticate(request)
+        assert [c.kwargs["check_revoked"] for c in verify.call_args_list] == [
+            True,
+            False,
+        ]
+
+    def test_malformed_token_checks_revocation(self) -> None:
+        request = factory.get("/beers/", HTTP_AUTHORIZATION="Bearer token-a")
+        with patch("config.authentication.auth.verify_id_token") as verify:
+            verify.return_value = _claims()
+            FirebaseAuthentication().authenticate(request)
+        assert verify.call_args.kwargs["check_revoked"] is True
+
+    def test_missing_firebase_internals_skip_certificate_cache(self, caplog) -> None:
+        request = factory.get("/beers/", HTTP_AUTHORIZATION="Bearer token-a")
+        with (
+            patch.dict(firebase_admin._apps, {"[DEFAULT]": object()}),
+            patch("config.authentication._certificate_cache_installed", False),
+            patch("config.authentication.firebase_admin.get_app"),
+            patch("config.authentication.auth._get_client", return_value=object()),
+            patch("config.authentication.auth.verify_id_token") as verify,
+        ):
+            verify.return_value = _claims()
+            user, _ = FirebaseAuthentication().authenticate(request)
+        assert user.email == "user@test.com"
+        assert "shared certificate cache" in caplog.text
+
+
+class TestDjangoCertificateCache:
+    def test_round_trip(self) -> None:
+        certs = _DjangoCertificateCache()
+        certs.set("https://certs", b"payload", 60)
+        assert certs.get("https://certs") == b"payload"
+        certs.delete("https://certs")
+        assert certs.get("https://certs") is None
+
+    def test_expired_entry_is_not_stored(self) -> None:
+        certs = _DjangoCertificateCache()
+        certs.set("https://stale", b"payload", 0)
+        assert certs.get("https://stale") is None
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+from config.middleware import BrowserAuthenticationMiddleware, BrowserSessionMiddleware
+from django.core.checks import run_checks
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory
+
+factory = RequestFactory()
+
+
+def _view(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(f"{hasattr(request, 'session')},{hasattr(request, 'user')}")
+
+
+def _handler():
+    return BrowserSessionMiddleware(BrowserAuthenticationMiddleware(_view))
+
+
+class TestBrowserOnlyMiddleware:
+    def test_api_request_skips_session(self) -> None:
+        response = _handler()(factory.get("/beers/"))
+        assert response.content == b"False,False"
+
+    def test_admin_request_gets_session(self) -> None:
+        response = _handler()(factory.get("/admin/"))
+        assert response.content == b"True,True"
+
+    def test_session_cookie_gets_session(self) -> None:
+        request = factory.get("/beers/")
+        request.COOKIES["sessionid"] = "abc"
+        response = _handler()(request)
+        assert response.content == b"True,True"
+
+    def test_admin_middleware_checks_pass(self) -> None:
+        ids = {message.id for message in run_checks(tags=["admin"])}
+        assert not ids & {"admin.E408", "admin.E409", "admin.E410"}
+
+
+@pytest.mark.django_db
+class TestMiddlewareStack:
+    def test_admin_login_runs_browser_middleware(self) -> None:
+        response = Client().get("/admin/login/")
+        assert response.status_code == 200
+        assert response["X-Frame-Options"] == "DENY"
+
+    def test_api_response_skips_browser_middleware(self) -> None:
+        response = Client().get("/countries/")
+        assert response.status_code == 200
+        assert "X-Frame-Options" not in response
+        assert "sessionid" not in response.cookies
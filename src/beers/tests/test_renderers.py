@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from config.renderers import ORJSONRenderer
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+
+class TestORJSONRenderer:
+    def test_matches_drf_renderer(self) -> None:
+        data = {
+            "name": "Ølmonopolet",
+            "price": Decimal("129.90"),
+            "token": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "updated": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+            "detail": gettext_lazy("Not found."),
+            1: [1.5, None, True],
+        }
+        rendered = ORJSONRenderer().render(data)
+        assert json.loads(rendered) == json.loads(JSONRenderer().render(data))
+
+    def test_none_renders_empty_body(self) -> None:
+        assert ORJSONRenderer().render(None) == b""
+
+    def test_indent_from_accept_header(self) -> None:
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+        assert rendered == b'{\n  "a": 1\n}'
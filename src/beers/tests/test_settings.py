@@ -49,3 +49,19 @@ def test_redis_env_uses_redis_cache_and_broker(
         assert "orm" not in settings_module.Q_CLUSTER
 
     importlib.reload(project_settings)
+
+
+def test_database_options_env_overrides_server_side_binding(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    with monkeypatch.context() as context:
+        context.setenv("DATABASE_OPTIONS", '{"server_side_binding": false}')
+        context.setenv("DATABASE_CONN_MAX_AGE", "0")
+        settings_module = importlib.reload(project_settings)
+
+        database = settings_module.DATABASES["default"]
+        assert database["OPTIONS"]["server_side_binding"] is False
+        assert database["CONN_MAX_AGE"] == 0
+        assert database["CONN_HEALTH_CHECKS"] is True
+
+    importlib.reload(project_settings)
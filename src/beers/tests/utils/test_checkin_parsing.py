@@ -1,6 +1,7 @@
 import io
 import json
 from datetime import datetime, timezone
+from unittest.mock import patch
 
 import pytest
 from beers.api.utils import (
@@ -8,10 +9,14 @@ from beers.api.utils import (
     _extract_checkin_data,
     _parse_checkin_time,
     bulk_import_tasted,
+    get_or_create_country,
     parse_untappd_file,
+    sync_unmatched_checkins,
 )
-from beers.models import Tasted, UntappdCheckin
+from beers.models import Country, Tasted, UntappdCheckin
 from beers.tests.factories import BeerFactory, UserFactory
+from beers.vmp.commands import VmpCommand
+from django.db import connection
 
 
 class TestParseCheckinTime:
@@ -35,6 +40,10 @@ class TestParseCheckinTime:
         assert result.month == 1
         assert result.day == 15
 
+    def test_iso_string_with_offset(self) -> None:
+        result = _parse_checkin_time("2024-01-15T10:30:00+01:00")
+        assert result == datetime(2024, 1, 15, 9, 30, 0, tzinfo=timezone.utc)
+
     def test_none_returns_none(self) -> None:
         assert _parse_checkin_time(None) is None
 
@@ -170,3 +179,64 @@ class TestBulkImportTasted:
         assert result["imported_count"] == 0
         assert UntappdCheckin.objects.filter(untpd_checkin_id=2001).exists()
         assert UntappdCheckin.objects.get(untpd_checkin_id=2001).synced is False
+
+
+@pytest.mark.django_db
+class TestSyncUnmatchedCheckins:
+    def test_syncs_in_flushed_batches(self) -> None:
+        users = [UserFactory(), UserFactory()]
+        beers = [BeerFactory(untpd_id=600), BeerFactory(untpd_id=601)]
+        UntappdCheckin.objects.bulk_create(
+            [
+                UntappdCheckin(untpd_checkin_id=3001, user=users[0], untpd_beer_id=600),
+                UntappdCheckin(untpd_checkin_id=3002, user=users[0], untpd_beer_id=600),
+                UntappdCheckin(untpd_checkin_id=3003, user=users[1], untpd_beer_id=601),
+                UntappdCheckin(untpd_checkin_id=3004, user=users[1], untpd_beer_id=999),
+            ]
+        )
+
+        with patch("beers.api.utils._SYNC_FLUSH_SIZE", 1):
+            result = sync_unmatched_checkins()
+
+        assert result == {"synced_count": 2, "users_affected": 2}
+        assert Tasted.objects.filter(user=users[0], beer=beers[0]).exists()
+        assert Tasted.objects.filter(user=users[1], beer=beers[1]).exists()
+        assert list(
+            UntappdCheckin.objects.filter(synced=False).values_list(
+                "untpd_checkin_id", flat=True
+            )
+        ) == [3004]
+
+    def test_nothing_unsynced_is_one_query(self, django_assert_num_queries) -> None:
+        with django_assert_num_queries(1):
+            assert sync_unmatched_checkins() == {"synced_count": 0, "users_affected": 0}
+
+
+@pytest.mark.django_db
+class TestGetOrCreateCountry:
+    def test_repeat_lookup_skips_database(self, django_assert_num_queries) -> None:
+        get_or_create_country("Norge")
+        with django_assert_num_queries(0):
+            country = get_or_create_country("Norge")
+        assert country.pk == "Norge"
+        assert Country.objects.filter(name="Norge").count() == 1
+
+    def test_empty_name_returns_none(self) -> None:
+        assert get_or_create_country("") is None
+
+    def test_deleted_country_is_recreated(self) -> None:
+        get_or_create_country("Norge")
+        Country.objects.filter(name="Norge").first().delete()
+        assert get_or_create_country("Norge").pk == "Norge"
+        assert Country.objects.filter(name="Norge").exists()
+
+    def test_importer_run_starts_with_fresh_lookups(self) -> None:
+        get_or_create_country("Norge")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {Country._meta.db_table} WHERE name = %s", ["Norge"]
+            )
+        with patch.object(VmpCommand, "handle", return_value=""):
+            VmpCommand().execute(skip_checks=True, no_color=False, force_color=False)
+        assert get_or_create_country("Norge") is not None
+        assert Country.objects.filter(name="Norge").exists()
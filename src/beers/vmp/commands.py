@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from beers.api.utils import get_or_create_country
+from beers.api.utils import clear_country_cache, get_or_create_country
 from beers.models import Beer
 from beers.vmp import VmpApiError, VmpClient
 from beers.vmp.models import VmpProduct
@@ -21,9 +21,11 @@ ALL_STORES_DELIVERY = "Kan bestilles til alle butikker"
 
 
 class VmpCommand(BaseCommand):
-    def get_client(
-        self, request_delay: tuple[float, float] | None = None
-    ) -> VmpClient:
+    def execute(self, *args, **options):
+        clear_country_cache()
+        return super().execute(*args, **options)
+
+    def get_client(self, request_delay: tuple[float, float] | None = None) -> VmpClient:
         try:
             return VmpClient.from_external_api(request_delay)
         except VmpApiError as exc:
@@ -1,49 +1,167 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone
+
+import firebase_admin
+from cachecontrol.adapter import CacheControlAdapter
+from cachecontrol.cache import BaseCache
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from firebase_admin import auth
+from google.auth import jwt
 from rest_framework import authentication, exceptions
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+_VERIFIED_TOKEN_TTL = 60 * 5
+_USER_ID_TTL = 60 * 60
+_CERTIFICATE_TTL = 60 * 60 * 24
+_REVOCATION_CHECK_TTL = 60
+
+BEARER = "Bearer "
+
+_certificate_cache_installed = False
+
+
+class _DjangoCertificateCache(BaseCache):
+    def get(self, key: str) -> bytes | None:
+        return cache.get(f"fbcert:{key}")
+
+    def set(
+        self, key: str, value: bytes, expires: int | datetime | None = None
+    ) -> None:
+        if isinstance(expires, datetime):
+            expires = int((expires - datetime.now(timezone.utc)).total_seconds())
+        ttl = _CERTIFICATE_TTL if expires is None else min(expires, _CERTIFICATE_TTL)
+        if ttl > 0:
+            cache.set(f"fbcert:{key}", value, ttl)
+
+    def delete(self, key: str) -> None:
+        cache.delete(f"fbcert:{key}")
+
+
+def _install_certificate_cache() -> None:
+    global _certificate_cache_installed
+    if _certificate_cache_installed or not firebase_admin._apps:
+        return
+    try:
+        client = auth._get_client(firebase_admin.get_app())
+        session = client._token_verifier.request.session
+    except AttributeError:
+        logger.warning(
+            "firebase_admin internals changed; verifying tokens without the shared certificate cache"
+        )
+    else:
+        session.mount("https://", CacheControlAdapter(_DjangoCertificateCache()))
+    _certificate_cache_installed = True
+
+
+def _cache_key(prefix: str, token: str) -> str:
+    return f"{prefix}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def _cache_verified(key: str, decoded_token: dict) -> None:
+    ttl = _VERIFIED_TOKEN_TTL
+    exp = decoded_token.get("exp")
+    if exp is not None:
+        ttl = min(ttl, int(exp - time.time()))
+    if ttl > 0:
+        cache.set(
+            key,
+            {"uid": decoded_token.get("uid"), "email": decoded_token.get("email")},
+            ttl,
+        )
+
+
+def _revocation_key(uid: str) -> str:
+    return f"fbrev:{uid}"
+
+
+def _needs_revocation_check(token: str) -> bool:
+    try:
+        uid = jwt.decode(token, verify=False).get("sub")
+    except ValueError:
+        return True
+    return not uid or cache.get(_revocation_key(uid)) is None
+
+
+def _mark_revocation_checked(decoded_token: dict) -> None:
+    uid = decoded_token.get("uid")
+    if uid:
+        cache.set(_revocation_key(uid), True, _REVOCATION_CHECK_TTL)
+
+
+def _get_user(email: str) -> User:
+    key = f"user_by_email:{email}"
+    user_id = cache.get(key)
+    if user_id is not None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            return user
+    user, _ = User.objects.get_or_create(email=email, defaults={"username": email})
+    cache.set(key, user.pk, _USER_ID_TTL)
+    return user
 
 
 class FirebaseAuthentication(authentication.BaseAuthentication):
-    def _get_bearer_token(self, request) -> str | None:
+    def authenticate(self, request) -> tuple[User, None] | None:
         auth_header: str = request.META.get("HTTP_AUTHORIZATION", "")
-        if auth_header.startswith("Bearer "):
-            return auth_header[7:]
-        return None
+        if not auth_header and "session" not in request.COOKIES:
+            return None
 
-    def authenticate(self, request) -> tuple[User, None] | None:
-        bearer_token = self._get_bearer_token(request)
+        bearer_token = (
+            auth_header[len(BEARER) :] if auth_header.startswith(BEARER) else None
+        )
 
         if bearer_token:
-            try:
-                decoded_token = auth.verify_id_token(bearer_token, check_revoked=True)
-            except auth.ExpiredIdTokenError:
-                raise exceptions.AuthenticationFailed("ID token has expired")
-            except auth.RevokedIdTokenError:
-                raise exceptions.AuthenticationFailed("ID token has been revoked")
-            except auth.InvalidIdTokenError:
-                raise exceptions.AuthenticationFailed("Invalid ID token")
-            except Exception:
-                raise exceptions.AuthenticationFailed("Authentication failed")
+            key = _cache_key("fbtok", bearer_token)
+            decoded_token = cache.get(key)
+            if decoded_token is None:
+                _install_certificate_cache()
+                check_revoked = _needs_revocation_check(bearer_token)
+                try:
+                    decoded_token = auth.verify_id_token(
+                        bearer_token, check_revoked=check_revoked
+                    )
+                except auth.ExpiredIdTokenError:
+                    raise exceptions.AuthenticationFailed("ID token has expired")
+                except auth.RevokedIdTokenError:
+                    raise exceptions.AuthenticationFailed("ID token has been revoked")
+                except auth.InvalidIdTokenError:
+                    raise exceptions.AuthenticationFailed("Invalid ID token")
+                except Exception:
+                    raise exceptions.AuthenticationFailed("Authentication failed")
+                if check_revoked:
+                    _mark_revocation_checked(decoded_token)
+                _cache_verified(key, decoded_token)
         else:
             session_cookie = request.COOKIES.get("session")
             if not session_cookie:
                 return None
-            try:
-                decoded_token = auth.verify_session_cookie(
-                    session_cookie, check_revoked=True
-                )
-            except auth.ExpiredSessionCookieError:
-                raise exceptions.AuthenticationFailed("Session has expired")
-            except auth.RevokedSessionCookieError:
-                raise exceptions.AuthenticationFailed("Session has been revoked")
-            except auth.InvalidSessionCookieError:
-                raise exceptions.AuthenticationFailed("Invalid session")
-            except Exception:
-                raise exceptions.AuthenticationFailed("Authentication failed")
+            key = _cache_key("fbsess", session_cookie)
+            decoded_token = cache.get(key)
+            if decoded_token is None:
+                _install_certificate_cache()
+                check_revoked = _needs_revocation_check(session_cookie)
+                try:
+                    decoded_token = auth.verify_session_cookie(
+                        session_cookie, check_revoked=check_revoked
+                    )
+                except auth.ExpiredSessionCookieError:
+                    raise exceptions.AuthenticationFailed("Session has expired")
+                except auth.RevokedSessionCookieError:
+                    raise exceptions.AuthenticationFailed("Session has been revoked")
+                except auth.InvalidSessionCookieError:
+                    raise exceptions.AuthenticationFailed("Invalid session")
+                except Exception:
+                    raise exceptions.AuthenticationFailed("Authentication failed")
+                if check_revoked:
+                    _mark_revocation_checked(decoded_token)
+                _cache_verified(key, decoded_token)
 
         uid: str | None = decoded_token.get("uid")
         email: str | None = decoded_token.get("email")
@@ -53,6 +171,4 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
         if not email:
             raise exceptions.AuthenticationFailed("Invalid token")
 
-        user, _ = User.objects.get_or_create(email=email, defaults={"username": email})
-
-        return (user, None)
+        return (_get_user(email), None)
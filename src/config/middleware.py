@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.http import HttpRequest, HttpResponse
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+
+
+def is_browser_request(request: HttpRequest) -> bool:
+    return (
+        request.path.startswith(tuple(settings.BROWSER_PATH_PREFIXES))
+        or settings.SESSION_COOKIE_NAME in request.COOKIES
+    )
+
+
+class BrowserOnlyMixin:
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not is_browser_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class BrowserSessionMiddleware(BrowserOnlyMixin, SessionMiddleware):
+    pass
+
+
+class BrowserAuthenticationMiddleware(BrowserOnlyMixin, AuthenticationMiddleware):
+    pass
+
+
+class BrowserMessageMiddleware(BrowserOnlyMixin, MessageMiddleware):
+    pass
+
+
+class BrowserXFrameOptionsMiddleware(BrowserOnlyMixin, XFrameOptionsMiddleware):
+    pass
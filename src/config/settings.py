@@ -59,15 +59,16 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django_hosts.middleware.HostsRequestMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "config.middleware.BrowserSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "config.middleware.BrowserAuthenticationMiddleware",
+    "config.middleware.BrowserMessageMiddleware",
+    "config.middleware.BrowserXFrameOptionsMiddleware",
     "django_hosts.middleware.HostsResponseMiddleware",
 ]
+BROWSER_PATH_PREFIXES = ["/admin/", "/api-auth/"]
 
 
 DATABASES = {
@@ -80,7 +81,14 @@ DATABASES = {
         "PASSWORD": os.getenv("DATABASE_PASSWORD", "123123"),
         "HOST": os.getenv("DATABASE_HOST", "127.0.0.1"),
         "PORT": os.getenv("DATABASE_PORT", 5432),
-        "OPTIONS": json.loads(os.getenv("DATABASE_OPTIONS", "{}")),
+        "CONN_MAX_AGE": int(os.getenv("DATABASE_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "server_side_binding": bool(
+                int(os.getenv("DATABASE_SERVER_SIDE_BINDING", 1))
+            ),
+            **json.loads(os.getenv("DATABASE_OPTIONS", "{}")),
+        },
     }
 }
 
@@ -117,6 +125,7 @@ TEMPLATES = [
 
 STATIC_ROOT = "/static2"
 STATIC_URL = "/static2/"
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", str(BASE_DIR / "media"))
 
 
 LANGUAGE_CODE = "en-us"
@@ -151,7 +160,7 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.TokenAuthentication",
     ),
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "config.renderers.ORJSONRenderer",
     ],
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_THROTTLE_RATES": {
@@ -193,6 +202,9 @@ else:
         }
     }
 
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "default"
+
 
 Q_CLUSTER = {
     "name": "beerapi",